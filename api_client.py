@@ -1,14 +1,89 @@
+import os
 import xbmcaddon
-from jellyseerr_api import JellyseerrClient
-from overseerr_api import OverseerrClient  # (Overseerr support is untested)
-
-addon = xbmcaddon.Addon()
-service = addon.getSetting("api_service")
-url = addon.getSetting("jellyseerr_url").rstrip("/") + "/api/v1"
-username = addon.getSetting("jellyseerr_username")
-password = addon.getSetting("jellyseerr_password")
-
-if service == "1":
-    client = OverseerrClient(url, username, password)
-else:
-    client = JellyseerrClient(url, username, password)
+import xbmcvfs
+
+# client, cache and metrics are built on first access (see __getattr__ below),
+# so routes that never talk to the server don't pay for the HTTP stack or SQLite.
+
+
+def _session_key(addon, service, url):
+    # One session file per server/user so switching accounts never reuses a stale login
+    import hashlib
+    username = addon.getSetting("jellyseerr_username")
+    return hashlib.sha1(f"{service}|{url}|{username}".encode('utf-8')).hexdigest()[:12]
+
+
+def _build_cache(addon, data_path, session_key):
+    # Cache entries are scoped the same way, a different server means different content
+    if not addon.getSettingBool("enable_response_cache"):
+        return None
+    from resources.lib.response_cache import ResponseCache
+    return ResponseCache(os.path.join(data_path, f"cache_{session_key}.db"))
+
+
+def _build_window_cache(session_key):
+    # Scoped like the response cache, the Home window is shared by every account on this Kodi
+    from resources.lib.window_cache import WindowCache
+    return WindowCache(session_key)
+
+
+def _build_metrics(addon, data_path):
+    if not addon.getSettingBool("collect_diagnostics"):
+        return None
+    from resources.lib.metrics import Metrics
+    return Metrics(os.path.join(data_path, "metrics.db"), log_each=addon.getSettingBool("log_request_timings"))
+
+
+def data_path(addon=None):
+    """The addon's addon_data directory, created on first use."""
+    addon = addon or xbmcaddon.Addon()
+    path = xbmcvfs.translatePath(f"special://profile/addon_data/{addon.getAddonInfo('id')}/")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _build():
+    addon = xbmcaddon.Addon()
+    service = addon.getSetting("api_service")
+    url = addon.getSetting("jellyseerr_url").rstrip("/") + "/api/v1"
+    username = addon.getSetting("jellyseerr_username")
+    password = addon.getSetting("jellyseerr_password")
+
+    addon_data = data_path(addon)
+
+    session_key = _session_key(addon, service, url)
+    cookie_file = os.path.join(addon_data, f"session_{session_key}.lwp")
+    circuit_file = os.path.join(addon_data, f"circuit_{session_key}.json")
+    cache = _build_cache(addon, addon_data, session_key)
+    metrics = _build_metrics(addon, addon_data)
+    window_cache = _build_window_cache(session_key)
+
+    # "1" = stale-while-revalidate: serve expired lists instantly, service.py refreshes them
+    serve_stale = addon.getSetting("cache_mode") == "1"
+
+    if service == "1":
+        from overseerr_api import OverseerrClient  # (Overseerr support is untested)
+        client = OverseerrClient(url, username, password, cookie_file=cookie_file, cache=cache, serve_stale=serve_stale,
+                                 metrics=metrics, circuit_file=circuit_file, window_cache=window_cache)
+    else:
+        from jellyseerr_api import JellyseerrClient
+        client = JellyseerrClient(url, username, password, cookie_file=cookie_file, cache=cache, serve_stale=serve_stale,
+                                  metrics=metrics, circuit_file=circuit_file, window_cache=window_cache)
+    return client, cache, metrics
+
+
+def flush():
+    """Saves the timings and cache counters recorded so far; a no-op if the client was never built."""
+    metrics = globals().get("metrics")
+    if metrics:
+        metrics.flush()
+    cache = globals().get("cache")
+    if cache:
+        cache.flush()
+
+
+def __getattr__(name):
+    if name in ("client", "cache", "metrics"):
+        globals()["client"], globals()["cache"], globals()["metrics"] = _build()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,139 @@
+"""Artwork bytes Kodi downloads to show one 20-item page.
+
+Renders a list route with the image proxy pointed at the stub server, then
+downloads every distinct artwork URL on the page the way Kodi's texture
+loader would. Scenarios cover the old fixed sizes (w500 posters, original
+fanart), sizes matched to 720p/1080p/4K screens, and the next page after
+the service pre-warmed the artwork cache. Service KB is what the service
+downloaded for the page and counts towards the total.
+
+    python benchmarks/bench_artwork.py
+    python benchmarks/bench_artwork.py --route popular_movies --latency-ms 30
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import urllib.request
+
+from bench_routes import ROUTES, BENCH_DIR
+from run_route import setup_path
+from stub_server import add_server_arguments, server_from_arguments
+
+CACHED = {"artwork_cache_mb": "200"}
+# (name, settings, info labels, whether the next page is measured after the service ran)
+SCENARIOS = (
+    ("largest (before)", {"artwork_size": "1"}, {}, False),
+    ("720p", {}, {"System.ScreenHeight": "720"}, False),
+    ("1080p", {}, {"System.ScreenHeight": "1080"}, False),
+    ("2160p", {}, {"System.ScreenHeight": "2160"}, False),
+    ("1080p, next page", CACHED, {"System.ScreenHeight": "1080"}, True),
+)
+
+
+def page_art(query, env):
+    result = subprocess.run(
+        [sys.executable, os.path.join(BENCH_DIR, "run_route.py"), query, "--json"],
+        env=env, capture_output=True, text=True,
+    )
+    if result.returncode:
+        raise RuntimeError(f"Route {query!r} failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])["art"]
+
+
+def service_pass():
+    """Does what one service.py tick does for lists and artwork: prefetch, then pre-warm. Prints the bytes downloaded."""
+    setup_path()
+    import xbmc
+    import xbmcaddon
+    import api_client
+    from resources.lib import prefetch
+    from resources.lib.artwork import ArtworkPolicy, Prewarmer
+    prefetcher = prefetch.Prefetcher(api_client.client, xbmc.Monitor(), spacing=0)
+    prefetcher.queue = []
+    prefetcher.schedule_next_page()
+    prefetcher.run(10)
+    policy = ArtworkPolicy.from_settings(xbmcaddon.Addon(), api_client.data_path())
+    prewarmer = Prewarmer(policy, api_client.cache)
+    downloaded = 0
+    while True:
+        tick = prewarmer.run()
+        if not tick:
+            break
+        downloaded += tick
+    print(downloaded)
+
+
+def run_service_pass(env):
+    result = subprocess.run([sys.executable, os.path.abspath(__file__), "--service-pass"],
+                            env=env, capture_output=True, text=True)
+    if result.returncode:
+        raise RuntimeError(f"Service pass failed:\n{result.stderr}")
+    return int(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--route", choices=ROUTES, default="trending")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    parser.add_argument("--service-pass", action="store_true", help=argparse.SUPPRESS)
+    add_server_arguments(parser)
+    args = parser.parse_args()
+    if args.service_pass:
+        return service_pass()
+
+    stub = server_from_arguments(args)
+    base_url = stub.start()
+    results = {}
+    try:
+        for name, settings, labels, next_page in SCENARIOS:
+            data_dir = tempfile.mkdtemp(prefix="kodiseerr-bench-")
+            settings = dict({"use_image_proxy": "true", "artwork_cache_mb": "0"}, **settings)
+            if args.https:
+                settings.setdefault("allow_self_signed", "true")
+            env = dict(os.environ, KODISEERR_BENCH_URL=base_url, KODISEERR_BENCH_DATA=data_dir,
+                       KODISEERR_BENCH_SETTINGS=json.dumps(settings),
+                       KODISEERR_BENCH_INFO_LABELS=json.dumps(labels))
+            try:
+                art = page_art(ROUTES[args.route], env)
+                service_bytes = 0
+                if next_page:
+                    service_bytes = run_service_pass(env)
+                    art = page_art(ROUTES[args.route] + "&page=2", env)
+                urls = {url for item in art for url in item.values() if url.startswith(("http:", "https:"))}
+                by_type = {}
+                for item in art:
+                    for art_type, url in item.items():
+                        by_type.setdefault(art_type, set()).add(url)
+                downloaded = {}
+                for url in urls:
+                    with urllib.request.urlopen(url) as resp:
+                        downloaded[url] = len(resp.read())
+                results[name] = {
+                    "items": len(art),
+                    "remote_urls": len(urls),
+                    "poster_kb": sum(downloaded.get(url, 0) for url in by_type.get("poster", ())) / 1024,
+                    "fanart_kb": sum(downloaded.get(url, 0) for url in by_type.get("fanart", ())) / 1024,
+                    "service_kb": service_bytes / 1024,
+                    "total_kb": (sum(downloaded.values()) + service_bytes) / 1024,
+                }
+            finally:
+                shutil.rmtree(data_dir, ignore_errors=True)
+    finally:
+        stub.stop()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"Artwork of one {args.route} page through the image proxy at {base_url}")
+    print(f"{'scenario':<18}{'items':>6}{'remote':>8}{'poster KB':>11}{'fanart KB':>11}{'service KB':>12}{'total KB':>10}")
+    for name, r in results.items():
+        print(f"{name:<18}{r['items']:>6}{r['remote_urls']:>8}{r['poster_kb']:>11.0f}{r['fanart_kb']:>11.0f}"
+              f"{r['service_kb']:>12.0f}{r['total_kb']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
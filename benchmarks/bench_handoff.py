@@ -0,0 +1,87 @@
+"""Server round trips of the media -> seasons -> request flow, with and without the window cache hand-off.
+
+Each step is a fresh plugin process like in Kodi. With the hand-off, the
+steps share Home window properties the way they would inside one Kodi
+session, so later steps reuse the details the media dialog fetched. Without
+it, every process starts with empty windows, as before the window cache.
+
+    python benchmarks/bench_handoff.py
+    python benchmarks/bench_handoff.py --latency-ms 80 --runs 5
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import tempfile
+from urllib.parse import urlencode
+
+from bench_routes import ROUTES, run_route
+from stub_server import add_server_arguments, server_from_arguments
+
+TV_ID = 7
+# (step, plugin query) in the order a user goes through them
+FLOW = (
+    ("open media dialog", ROUTES["media"]),
+    ("list seasons", urlencode({"mode": "list_seasons", "id": TV_ID})),
+    ("request seasons", urlencode({"mode": "request_seasons", "tv_id": TV_ID, "seasons": "[1, 2]"})),
+    ("reopen media dialog", ROUTES["media"]),
+)
+
+
+def run_flow(stub, base_url, shared):
+    """Runs FLOW once from an empty addon_data and returns [(server requests, elapsed ms)] per step."""
+    data_dir = tempfile.mkdtemp(prefix="kodiseerr-bench-")
+    window_file = os.path.join(data_dir, "windows.json")
+    env = dict(os.environ, KODISEERR_BENCH_URL=base_url, KODISEERR_BENCH_DATA=data_dir,
+               KODISEERR_BENCH_SETTINGS=json.dumps({"allow_self_signed": "true"} if stub.https else {}),
+               KODISEERR_BENCH_WINDOW_FILE=window_file)
+    steps = []
+    try:
+        for _, query in FLOW:
+            if not shared and os.path.exists(window_file):
+                os.remove(window_file)
+            before = stub.totals()["requests"]
+            outcome = run_route(query, env)
+            steps.append((stub.totals()["requests"] - before, outcome["elapsed_ms"]))
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+    return steps
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    stub = server_from_arguments(args)
+    base_url = stub.start()
+    results = {}
+    try:
+        for name, shared in (("separate", False), ("hand-off", True)):
+            runs = [run_flow(stub, base_url, shared) for _ in range(args.runs)]
+            results[name] = [
+                {"step": step, "requests": statistics.mean(run[i][0] for run in runs),
+                 "p50_ms": statistics.median(run[i][1] for run in runs)}
+                for i, (step, _) in enumerate(FLOW)
+            ]
+    finally:
+        stub.stop()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{args.runs} runs of the flow against {base_url}, latency {args.latency_ms:g} ms "
+          f"(the first step also logs in)")
+    print(f"{'step':<22}{'separate':>18}{'hand-off':>18}")
+    for i, (step, _) in enumerate(FLOW):
+        cells = "".join(f"{r[i]['requests']:>6.1f} req{r[i]['p50_ms']:>7.1f}ms" for r in results.values())
+        print(f"{step:<22}{cells}")
+    for name, steps in results.items():
+        print(f"{name}: {sum(s['requests'] for s in steps):.1f} server requests for the whole flow")
+
+
+if __name__ == "__main__":
+    main()
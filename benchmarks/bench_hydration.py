@@ -0,0 +1,95 @@
+"""Wall time of hydrating the Request Progress view, one request at a time versus api_request_many.
+
+Fetches the details of as many media as the view shows (25) against the
+stub server with artificial latency: one after another like the view used
+to, and through api_request_many's thread pool. The last scenario has the
+server drop the session right before the batch, so every worker is
+rejected at once and has to share a single new login.
+
+    python benchmarks/bench_hydration.py
+    python benchmarks/bench_hydration.py --latency-ms 100 --items 50 --workers 8
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+from run_route import setup_path
+from stub_server import add_server_arguments, server_from_arguments
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=25, help="details fetched per run")
+    parser.add_argument("--workers", type=int, default=None, help="api_request_many workers (default: the client's)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    add_server_arguments(parser)
+    parser.set_defaults(latency_ms=50)
+    args = parser.parse_args()
+
+    stub = server_from_arguments(args)
+    base_url = stub.start()
+    data_dir = tempfile.mkdtemp(prefix="kodiseerr-bench-")
+    settings = {"allow_self_signed": "true"} if args.https else {}
+    os.environ.update(KODISEERR_BENCH_URL=base_url, KODISEERR_BENCH_DATA=data_dir,
+                      KODISEERR_BENCH_SETTINGS=json.dumps(settings))
+    setup_path()
+    from jellyseerr_api import JellyseerrClient
+    from resources.lib import seerr_client
+
+    workers = args.workers or seerr_client.MAX_WORKERS
+    endpoints = [f"/{'tv' if n % 2 else 'movie'}/{n}" for n in range(1, args.items + 1)]
+
+    def serial(client):
+        return [client.api_request(endpoint) for endpoint in endpoints]
+
+    def concurrent(client):
+        return client.api_request_many(endpoints, max_workers=workers)
+
+    def session_dropped(client):
+        with stub.lock:
+            stub.sessions.clear()
+        return concurrent(client)
+
+    scenarios = (("serial", serial), (f"{workers} workers", concurrent),
+                 (f"{workers} workers, session dropped", session_dropped))
+    results = {}
+    try:
+        for name, run in scenarios:
+            timings, requests, logins, missing = [], [], [], []
+            for _ in range(args.runs):
+                client = JellyseerrClient(base_url + "/api/v1", "bench@example.com", "bench")
+                client.login()
+                stub.reset_stats()
+                started = time.perf_counter()
+                fetched = run(client)
+                timings.append((time.perf_counter() - started) * 1000)
+                client.pool.close()
+                requests.append(stub.totals()["requests"])
+                logins.append(stub.stats.get("POST /auth/local", {}).get("requests", 0))
+                missing.append(sum(result is None for result in fetched))
+            results[name] = {
+                "p50_ms": statistics.median(timings),
+                "requests": statistics.mean(requests),
+                "logins": max(logins),
+                "missing": max(missing),
+            }
+    finally:
+        stub.stop()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{len(endpoints)} details per run, {args.runs} runs against {base_url}, latency {args.latency_ms:g} ms")
+    print(f"{'scenario':<30}{'p50':>10}{'reqs':>7}{'logins':>8}{'missing':>9}")
+    for name, r in results.items():
+        print(f"{name:<30}{r['p50_ms']:>8.1f}ms{r['requests']:>7.1f}{r['logins']:>8}{r['missing']:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Cost of the library index on a synthetic library of 20k movies.
+
+Fills the stub JSON-RPC library with movies and TV shows (some sharing a
+title, like remakes), then times what the service and the plugin do with
+the index: building and saving it, loading it and the smaller file of
+owned TMDB ids the plugin reads, lookups, and the VideoLibrary
+notifications the service applies one at a time. "full reindex" is what
+every notification used to cost.
+
+    python benchmarks/bench_library.py
+    python benchmarks/bench_library.py --movies 50000 --tvshows 5000
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+from run_route import setup_path
+
+TITLE_WORDS = ("The", "Last", "Dark", "Star", "Night", "Return", "Amélie", "Spider-Man", "City", "of", "Love", "War")
+
+
+def make_movie(movieid):
+    # Every 50th movie is a remake of the one before it, same title but another year
+    base = movieid - 1 if movieid % 50 == 1 and movieid > 1 else movieid
+    words = [TITLE_WORDS[(base * 7 + n * 3) % len(TITLE_WORDS)] for n in range(3)]
+    return {
+        "movieid": movieid,
+        "title": f"{' '.join(words)} {base}",
+        "year": 1950 + movieid % 75,
+        "file": f"/media/movies/{movieid}.mkv",
+        "uniqueid": {"tmdb": str(100000 + movieid), "imdb": f"tt{1000000 + movieid}"},
+        "playcount": movieid % 3,
+    }
+
+
+def make_tvshow(tvshowid):
+    return {"tvshowid": tvshowid, "title": f"Show {tvshowid}: The Series", "year": 1990 + tvshowid % 35,
+            "uniqueid": {"tmdb": str(500000 + tvshowid), "tvdb": str(300000 + tvshowid)}}
+
+
+def timed(run, repeat):
+    """Median milliseconds of run() over repeat calls."""
+    timings = []
+    for n in range(repeat):
+        started = time.perf_counter()
+        run(n)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--movies", type=int, default=20000)
+    parser.add_argument("--tvshows", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=50, help="notifications and lookups timed per step")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix="kodiseerr-bench-")
+    os.environ["KODISEERR_BENCH_DATA"] = data_dir
+    setup_path()
+    import xbmc
+    from resources.lib import library_index
+    from resources.lib.library_index import LibraryIndex, OwnedTitles
+
+    xbmc.LIBRARY["movies"] = {n: make_movie(n) for n in range(1, args.movies + 1)}
+    xbmc.LIBRARY["tvshows"] = {n: make_tvshow(n) for n in range(1, args.tvshows + 1)}
+    path = os.path.join(data_dir, library_index.INDEX_FILE)
+    owned_path = os.path.join(data_dir, library_index.OWNED_FILE)
+
+    def notify(method, item_type, library_id):
+        item = {"type": item_type, "id": library_id}
+        index.handle_notification(method, json.dumps({"item": item} if method.endswith("OnUpdate") else item))
+
+    def watched(n):
+        movie = xbmc.LIBRARY["movies"][n % args.movies + 1]
+        movie["playcount"] += 1
+        notify("VideoLibrary.OnUpdate", "movie", movie["movieid"])
+
+    def renamed(n):
+        movie = xbmc.LIBRARY["movies"][n % args.movies + 1]
+        movie["title"] += " (Director's Cut)"
+        notify("VideoLibrary.OnUpdate", "movie", movie["movieid"])
+
+    def added(n):
+        movieid = args.movies + 1000 + n
+        xbmc.LIBRARY["movies"][movieid] = make_movie(movieid)
+        notify("VideoLibrary.OnUpdate", "movie", movieid)
+
+    def removed(n):
+        movieid = args.movies + 1000 + n
+        del xbmc.LIBRARY["movies"][movieid]
+        notify("VideoLibrary.OnRemove", "movie", movieid)
+
+    try:
+        # Titles are normalized once per process and remembered, so the first build pays for it
+        library_index.normalize_title.cache_clear()
+        started = time.perf_counter()
+        index = LibraryIndex()
+        index.rebuild()
+        results = {"build (first)": (time.perf_counter() - started) * 1000}
+        # Titles are normalized again each time, like every notification used to do
+        results["full reindex"] = timed(lambda n: library_index.normalize_title.cache_clear() or index._reindex(), 3)
+        results["save"] = timed(lambda n: index.save(path, owned_path), 3)
+        results["load (index)"] = timed(lambda n: LibraryIndex.load(path), 3)
+        results["load (plugin)"] = timed(lambda n: OwnedTitles.load(owned_path), 3)
+        results["lookup by tmdb id"] = timed(
+            lambda n: index.find_movie(tmdb_id=str(100001 + n * 37 % args.movies)), args.repeat)
+        results["lookup by title"] = timed(
+            lambda n: index.find_movie(title=make_movie(n * 37 % args.movies + 1)["title"]), args.repeat)
+        results["OnUpdate, watched"] = timed(watched, args.repeat)
+        results["OnUpdate, renamed"] = timed(renamed, args.repeat)
+        results["OnUpdate, new movie"] = timed(added, args.repeat)
+        results["OnRemove"] = timed(removed, args.repeat)
+        consistent = index.movie_keys == LibraryIndex._keys(index.movies, set())
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(dict(results, consistent=consistent), indent=2))
+        return
+    print(f"Library of {args.movies} movies and {args.tvshows} TV shows, median of {args.repeat} notifications or lookups")
+    for name, ms in results.items():
+        print(f"{name:<22}{ms:>10.3f} ms")
+    print(f"keys after the notifications match a full reindex: {'yes' if consistent else 'no'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Bytes on the wire and peak memory of fetching details pages.
+
+Fetches /movie/{id} and /tv/{id} pages one after another, like the Request
+Progress view does, once per scenario: with and without response
+compression, and with and without trimming unused fields. Peak memory is
+the most tracemalloc sees allocated while one request is fetched and
+decoded, the number that matters on low-memory boxes like a Raspberry Pi.
+
+    python benchmarks/bench_payload.py
+    python benchmarks/bench_payload.py --credits 150 --pages 50 --latency-ms 20
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from run_route import setup_path
+from stub_server import add_server_arguments, server_from_arguments
+
+# (name, compression, trim unused fields)
+SCENARIOS = (
+    ("plain", "none", False),
+    ("plain, trimmed", "none", True),
+    ("gzip", "gzip", False),
+    ("gzip, trimmed", "gzip", True),
+    ("deflate, trimmed", "deflate", True),
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=25, help="details pages fetched per scenario")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    add_server_arguments(parser)
+    parser.set_defaults(credits=80)
+    args = parser.parse_args()
+
+    stub = server_from_arguments(args)
+    base_url = stub.start()
+    data_dir = tempfile.mkdtemp(prefix="kodiseerr-bench-")
+    settings = {"allow_self_signed": "true"} if args.https else {}
+    os.environ.update(KODISEERR_BENCH_URL=base_url, KODISEERR_BENCH_DATA=data_dir,
+                      KODISEERR_BENCH_SETTINGS=json.dumps(settings))
+    setup_path()
+    from resources.lib import seerr_client
+    from jellyseerr_api import JellyseerrClient
+
+    trim = seerr_client.project
+    endpoints = [f"/{'tv' if n % 2 else 'movie'}/{n}" for n in range(1, args.pages + 1)]
+    results = {}
+    try:
+        for name, compression, trimmed in SCENARIOS:
+            stub.compression = compression
+            seerr_client.project = trim if trimmed else (lambda endpoint, data: data)
+            client = JellyseerrClient(base_url + "/api/v1", "bench@example.com", "bench")
+            client.login()
+            stub.reset_stats()
+            timings, peaks, kept = [], [], []
+            for endpoint in endpoints:
+                started = time.perf_counter()
+                result = client.api_request(endpoint, params={})
+                timings.append((time.perf_counter() - started) * 1000)
+                kept.append(len(json.dumps(result)))
+            totals = stub.totals()
+            # Tracing slows allocation down a lot, so memory gets a pass of its own
+            tracemalloc.start()
+            for endpoint in endpoints:
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+                client.api_request(endpoint, params={})
+                peaks.append(tracemalloc.get_traced_memory()[1] - before)
+            tracemalloc.stop()
+            client.pool.close()
+            results[name] = {
+                "wire_kb": totals["bytes"] / len(endpoints) / 1024,
+                "kept_kb": statistics.mean(kept) / 1024,
+                "peak_kb": max(peaks) / 1024,
+                "p50_ms": statistics.median(timings),
+                "errors": totals["errors"],
+            }
+    finally:
+        seerr_client.project = trim
+        stub.stop()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{len(endpoints)} details pages per scenario against {base_url}, {args.credits} cast members per page, "
+          f"latency {args.latency_ms:g} ms")
+    print(f"{'scenario':<18}{'wire KB':>9}{'kept KB':>9}{'peak KB':>9}{'p50':>9}")
+    for name, r in results.items():
+        print(f"{name:<18}{r['wire_kb']:>9.1f}{r['kept_kb']:>9.1f}{r['peak_kb']:>9.1f}{r['p50_ms']:>7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Bytes and server requests per request poll against a server with a long request history.
+
+Seeds the stub with many requests (10k by default) of which only the newest
+few are still pending, then walks RequestPoller through the polls a service
+would make: the first one, one where nothing changed, one after new
+requests were made and one after tracked requests became available. Each
+step is measured in both notification scopes, next to reading the whole
+request history the way a full re-read would.
+
+    python benchmarks/bench_poller.py
+    python benchmarks/bench_poller.py --requests 50000 --pending 200 --latency-ms 20
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+
+from run_route import setup_path
+from stub_server import add_server_arguments, server_from_arguments
+
+CHANGES = 5  # requests made, and tracked requests made available, per step
+
+
+def full_read(client, page_size=100):
+    """Every page of /request, newest first."""
+    skip = 0
+    while True:
+        data = client.api_request('/request', params={'take': page_size, 'skip': skip, 'sort': 'modified'})
+        results = (data or {}).get('results') or []
+        skip += page_size
+        if len(results) < page_size:
+            return
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pending", type=int, default=50, help="newest seeded requests left pending")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    add_server_arguments(parser)
+    parser.set_defaults(requests=10000)
+    args = parser.parse_args()
+
+    stub = server_from_arguments(args)
+    # Old requests have long been dealt with on a real server
+    for request_id in stub.pending_ids()[:-args.pending]:
+        stub.mark_available(request_id)
+    base_url = stub.start()
+    data_dir = tempfile.mkdtemp(prefix="kodiseerr-bench-")
+    settings = {"allow_self_signed": "true"} if args.https else {}
+    os.environ.update(KODISEERR_BENCH_URL=base_url, KODISEERR_BENCH_DATA=data_dir,
+                      KODISEERR_BENCH_SETTINGS=json.dumps(settings))
+    setup_path()
+    from jellyseerr_api import JellyseerrClient
+    from resources.lib.request_poller import RequestPoller
+
+    client = JellyseerrClient(base_url + "/api/v1", "bench@example.com", "bench")
+    client.login()
+    pollers = {
+        scope: RequestPoller(client, os.path.join(data_dir, f"{scope}.json"), processing_only=scope == "processing")
+        for scope in ("all", "processing")
+    }
+
+    def measure(run):
+        stub.reset_stats()
+        announced = run()
+        totals = stub.totals()
+        return {"requests": totals["requests"], "kb": totals["bytes"] / 1024,
+                "announced": len(announced) if announced is not None else None}
+
+    def poll_all():
+        return {scope: measure(poller.poll) for scope, poller in pollers.items()}
+
+    results = {}
+    try:
+        results["full history read"] = {"all": measure(lambda: full_read(client) or [])}
+        results["first poll"] = poll_all()
+        results["nothing changed"] = poll_all()
+        for _ in range(CHANGES):
+            stub.route("POST", "/request", {}, {"mediaType": "movie"})
+        results[f"{CHANGES} new requests"] = poll_all()
+        for request_id in stub.pending_ids()[-CHANGES:]:
+            stub.mark_available(request_id)
+        results[f"{CHANGES} became available"] = poll_all()
+        results["nothing changed again"] = poll_all()
+    finally:
+        client.pool.close()
+        stub.stop()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"Polls against {base_url} seeded with {args.requests} requests, {args.pending} pending, "
+          f"latency {args.latency_ms:g} ms")
+    print(f"{'step':<24}{'all requests':>28}{'processing only':>28}")
+    for step, scopes in results.items():
+        cells = ""
+        for scope in ("all", "processing"):
+            r = scopes.get(scope)
+            cells += f"{r['requests']:>5} req{r['kb']:>9.1f} KB{r['announced'] or 0:>5} avl" if r else f"{'-':>28}"
+        print(f"{step:<24}{cells}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Time render_media_items() takes to build one page of 20, 100 and 500 list items.
+
+Loads default.py once with the stub xbmc modules, then renders pages of
+synthetic discover results (the stub server's media, no network involved)
+over and over. Covers make_info, artwork, the InfoTagVideo setters and the
+bulk addDirectoryItems call, not the server round trip.
+
+    python benchmarks/bench_render.py
+    python benchmarks/bench_render.py --sizes 20 1000 --runs 50 --payload-bytes 2000
+"""
+import argparse
+import json
+import os
+import runpy
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+from bench_routes import parse_setting
+from run_route import ADDON_DIR, setup_path
+from stub_server import StubServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 100, 500], help="items per page")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--payload-bytes", type=int, default=0, help="extra overview text per media item")
+    parser.add_argument("--setting", action="append", type=parse_setting, default=[], metavar="ID=VALUE",
+                        help="override an addon setting, may be repeated")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix="kodiseerr-bench-")
+    os.environ.update(KODISEERR_BENCH_DATA=data_dir, KODISEERR_BENCH_SETTINGS=json.dumps(dict(args.setting)))
+    setup_path()
+    import xbmcplugin
+
+    stub = StubServer(payload_bytes=args.payload_bytes)
+    results = {}
+    try:
+        # Loading default.py renders the main menu, which needs no server
+        sys.argv = ["plugin://plugin.video.kodiseerr/", "1", "?"]
+        plugin = runpy.run_path(os.path.join(ADDON_DIR, "default.py"), run_name="kodiseerr_bench")
+        render = plugin["render_media_items"]
+        for size in args.sizes:
+            items = [stub.media(n, "tv" if n % 3 == 0 else "movie") for n in range(1, size + 1)]
+            timings = []
+            for _ in range(args.runs):
+                del xbmcplugin.ITEMS[:]
+                started = time.perf_counter()
+                render(items, current_page=2, total_pages=5, mode="trending", content_type="movies", route_args={})
+                timings.append((time.perf_counter() - started) * 1000)
+            results[size] = {
+                "p50_ms": statistics.median(timings),
+                "max_ms": max(timings),
+                "us_per_item": statistics.median(timings) * 1000 / size,
+                "entries": len(xbmcplugin.ITEMS),
+            }
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"render_media_items, {args.runs} runs per page size, {args.payload_bytes} extra overview bytes per item")
+    print(f"{'items':>6}{'p50':>11}{'max':>11}{'per item':>12}{'entries':>9}")
+    for size, r in results.items():
+        print(f"{size:>6}{r['p50_ms']:>9.2f}ms{r['max_ms']:>9.2f}ms{r['us_per_item']:>10.1f}us{r['entries']:>9}")
+
+
+if __name__ == "__main__":
+    main()
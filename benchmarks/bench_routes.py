@@ -0,0 +1,137 @@
+"""End-to-end latency of plugin routes against the stub server.
+
+Every run is a fresh Python process, like a Kodi navigation. The first run
+of each route starts from an empty addon_data directory (cold: login, empty
+cache); the rest reuse it (warm), unless --cold is given.
+
+    python benchmarks/bench_routes.py
+    python benchmarks/bench_routes.py --latency-ms 50 --runs 20 trending requests
+    python benchmarks/bench_routes.py --https --setting items_per_screen=2
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import urlencode
+
+from stub_server import add_server_arguments, server_from_arguments
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# name -> plugin query
+ROUTES = {
+    "main_menu": "",
+    "trending": "mode=trending",
+    "trending_page_3": "mode=trending&page=3",
+    "popular_movies": "mode=popular_movies",
+    "upcoming_tv": "mode=upcoming_tv",
+    "genres": "mode=genres&media_type=movie",
+    "genre": "mode=genre&display_type=movies&genre_id=28",
+    "requests": "mode=requests",
+    "diagnostics": "mode=diagnostics",
+    # Requests everything on the first popular movies screen; run with KODISEERR_BENCH_MULTISELECT=all
+    "request_multiple": "mode=request_multiple&list_mode=popular_movies",
+    "media": urlencode({"mode": "media", "media_type": "tv", "media_id": 7, "preview": json.dumps(
+        {"name": "Show 7", "posterPath": "/poster7.jpg", "overview": "Overview of Show 7.", "voteAverage": 7.1})}),
+}
+
+
+def parse_setting(text):
+    key, _, value = text.partition("=")
+    return key, value
+
+
+def run_route(query, env):
+    result = subprocess.run(
+        [sys.executable, os.path.join(BENCH_DIR, "run_route.py"), query, "--json"],
+        env=env, capture_output=True, text=True,
+    )
+    if result.returncode:
+        raise RuntimeError(f"Route {query!r} failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("routes", nargs="*", help=f"routes to run (default: all of {', '.join(ROUTES)})")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--cold", action="store_true", help="start every run from empty addon_data")
+    parser.add_argument("--setting", action="append", type=parse_setting, default=[], metavar="ID=VALUE",
+                        help="override an addon setting, may be repeated")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    names = args.routes or list(ROUTES)
+    unknown = [name for name in names if name not in ROUTES]
+    if unknown:
+        parser.error(f"unknown routes: {', '.join(unknown)}")
+
+    settings = dict(args.setting)
+    if args.https:
+        settings.setdefault("allow_self_signed", "true")
+
+    stub = server_from_arguments(args)
+    base_url = stub.start()
+    data_dir = tempfile.mkdtemp(prefix="kodiseerr-bench-")
+    env = dict(os.environ, KODISEERR_BENCH_URL=base_url, KODISEERR_BENCH_DATA=data_dir,
+               KODISEERR_BENCH_SETTINGS=json.dumps(settings))
+    results = {}
+    try:
+        for name in names:
+            shutil.rmtree(data_dir, ignore_errors=True)
+            timings, server_requests, server_bytes, opened = [], [], [], []
+            started = time.perf_counter()
+            for run in range(args.runs):
+                if args.cold and run:
+                    shutil.rmtree(data_dir, ignore_errors=True)
+                before = stub.totals()
+                outcome = run_route(ROUTES[name], env)
+                after = stub.totals()
+                timings.append(outcome["elapsed_ms"])
+                if outcome.get("dialog"):
+                    opened.append(outcome["dialog"]["open_ms"])
+                server_requests.append(after["requests"] - before["requests"])
+                server_bytes.append(after["bytes"] - before["bytes"])
+            wall = time.perf_counter() - started
+            warm = timings[1:] or timings
+            results[name] = {
+                "cold_ms": timings[0],
+                "p50_ms": statistics.median(warm),
+                "p95_ms": percentile(warm, 0.95),
+                "mean_ms": statistics.mean(warm),
+                "runs_per_s": args.runs / wall,
+                "server_requests": statistics.mean(server_requests[1:] or server_requests),
+                "server_kb": statistics.mean(server_bytes[1:] or server_bytes) / 1024,
+                "items": outcome["items"],
+                # When a dialog route put its window up, the rest of the run is the dialog loading
+                "open_ms": statistics.median(opened[1:] or opened) if opened else None,
+            }
+    finally:
+        stub.stop()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{args.runs} runs per route against {base_url}, latency {args.latency_ms:g} ms, error rate {args.error_rate:g}")
+    print(f"{'route':<16}{'cold':>9}{'p50':>9}{'p95':>9}{'mean':>9}{'runs/s':>8}{'reqs':>7}{'KB':>8}{'items':>7}"
+          f"{'open':>9}")
+    for name, r in results.items():
+        opened = f"{r['open_ms']:>7.1f}ms" if r['open_ms'] is not None else f"{'-':>9}"
+        print(f"{name:<16}{r['cold_ms']:>7.1f}ms{r['p50_ms']:>7.1f}ms{r['p95_ms']:>7.1f}ms{r['mean_ms']:>7.1f}ms"
+              f"{r['runs_per_s']:>8.1f}{r['server_requests']:>7.1f}{r['server_kb']:>8.1f}{r['items']:>7}{opened}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Runs service.py's main loop for hours of virtual time against the stub server.
+
+The stub Monitor advances a virtual clock instead of sleeping, so six hours
+of polling, prefetching and cache refreshing finish in seconds. Requests are
+marked available on the server at a fixed virtual interval, and the report
+shows how long the service took to announce them and what it cost the server.
+
+    python benchmarks/bench_service.py --hours 6 --available-every 900
+    python benchmarks/bench_service.py --setting notification_scope=1 --requests 5000
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+from run_route import setup_path
+from stub_server import add_server_arguments, server_from_arguments
+
+
+def parse_setting(text):
+    key, _, value = text.partition("=")
+    return key, value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=float, default=6, help="virtual time to run the loop for")
+    parser.add_argument("--available-every", type=float, default=900, metavar="SECONDS",
+                        help="virtual seconds between requests turning available on the server (0 for never)")
+    parser.add_argument("--setting", action="append", type=parse_setting, default=[], metavar="ID=VALUE",
+                        help="override an addon setting, may be repeated")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    stub = server_from_arguments(args)
+    base_url = stub.start()
+    data_dir = tempfile.mkdtemp(prefix="kodiseerr-bench-")
+    settings = dict(args.setting)
+    if args.https:
+        settings.setdefault("allow_self_signed", "true")
+    os.environ.update(KODISEERR_BENCH_URL=base_url, KODISEERR_BENCH_DATA=data_dir,
+                      KODISEERR_BENCH_SETTINGS=json.dumps(settings))
+
+    setup_path()
+    import xbmc
+    import xbmcgui
+
+    clock = xbmc.VirtualClock(args.hours * 3600, time.time)
+    xbmc.CLOCK = clock
+    time.time = clock.now
+
+    # Turn requests available on the server as virtual time passes
+    marked = {}  # title -> virtual time it became available
+    pending = stub.pending_ids()
+    next_mark = [clock.now() + args.available_every]
+    advance = clock.advance
+
+    def advance_and_mark(seconds):
+        advance(seconds)
+        while args.available_every and pending and clock.now() >= next_mark[0]:
+            request_id = pending.pop()
+            stub.mark_available(request_id)
+            marked[f"Request {request_id}"] = next_mark[0]
+            next_mark[0] += args.available_every
+    clock.advance = advance_and_mark
+
+    announced = {}  # title -> virtual time the notification was shown
+    notification = xbmcgui.Dialog.notification
+
+    def record_notification(self, heading, message, *rest, **kwargs):
+        title = message.replace(" is now available!", "")
+        announced.setdefault(title, clock.now())
+        notification(self, heading, message, *rest, **kwargs)
+    xbmcgui.Dialog.notification = record_notification
+
+    real_started = time.perf_counter()
+    try:
+        import service
+        service.main_loop()
+    finally:
+        real_seconds = time.perf_counter() - real_started
+        stub.stop()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    delays = [announced[title] - marked_at for title, marked_at in marked.items() if title in announced]
+    totals = stub.totals()
+    results = {
+        "virtual_hours": args.hours,
+        "real_seconds": real_seconds,
+        "server_requests": totals["requests"],
+        "server_kb": totals["bytes"] / 1024,
+        "server_errors": totals["errors"],
+        "requests_per_hour": totals["requests"] / args.hours,
+        "made_available": len(marked),
+        "announced": len(delays),
+        "announce_delay_p50_s": statistics.median(delays) if delays else None,
+        "announce_delay_max_s": max(delays) if delays else None,
+        "endpoints": stub.stats,
+    }
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{args.hours:g} virtual hours in {real_seconds:.1f}s against {base_url}, latency {args.latency_ms:g} ms")
+    print(f"server: {totals['requests']} requests ({results['requests_per_hour']:.1f}/h), "
+          f"{results['server_kb']:.1f} KB, {totals['errors']} errors")
+    if delays:
+        print(f"announced {len(delays)} of {len(marked)} newly available requests, "
+              f"delay p50 {results['announce_delay_p50_s']:.0f}s, max {results['announce_delay_max_s']:.0f}s")
+    else:
+        print(f"announced 0 of {len(marked)} newly available requests")
+    for name, entry in sorted(stub.stats.items(), key=lambda item: -item[1]["requests"]):
+        print(f"  {entry['requests']:>6}  {entry['bytes'] / 1024:>9.1f} KB  {name}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""Requests per second through the shared HTTP transport against the stub server over HTTPS.
+
+Sends the same small API request over and over: through urllib with a new
+connection each time like the old backends did, through ConnectionPool
+with keep-alive turned off, through the pool as the addon uses it, and
+through api_request_many's workers sharing the pool. Handshakes counts the
+TCP/TLS connections the transport opened.
+
+    python benchmarks/bench_transport.py
+    python benchmarks/bench_transport.py --count 500 --latency-ms 5
+"""
+import argparse
+import json
+import os
+import shutil
+import ssl
+import tempfile
+import time
+import urllib.request
+
+from run_route import setup_path
+from stub_server import add_server_arguments, server_from_arguments
+
+ENDPOINT = "/genres/movie"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=200, help="requests per scenario")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    add_server_arguments(parser)
+    parser.set_defaults(https=True)
+    args = parser.parse_args()
+
+    stub = server_from_arguments(args)
+    base_url = stub.start()
+    data_dir = tempfile.mkdtemp(prefix="kodiseerr-bench-")
+    os.environ.update(KODISEERR_BENCH_URL=base_url, KODISEERR_BENCH_DATA=data_dir,
+                      KODISEERR_BENCH_SETTINGS=json.dumps({"allow_self_signed": "true"}))
+    setup_path()
+    from jellyseerr_api import JellyseerrClient
+
+    api_url = base_url + "/api/v1"
+    client = JellyseerrClient(api_url, "bench@example.com", "bench")
+    client.login()
+    handshakes = [0]
+    connect = client.pool._connect
+
+    def counted_connect(*connect_args):
+        handshakes[0] += 1
+        return connect(*connect_args)
+    client.pool._connect = counted_connect
+
+    def urllib_fresh():
+        context = ssl._create_unverified_context()
+        opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(client.cookie_jar),
+                                             urllib.request.HTTPSHandler(context=context))
+        for _ in range(args.count):
+            with opener.open(api_url + ENDPOINT) as resp:
+                resp.read()
+                handshakes[0] += 1
+
+    def pool_sequential(max_idle):
+        def run():
+            client.pool.close()
+            client.pool.max_idle = max_idle
+            for _ in range(args.count):
+                client.api_request(ENDPOINT)
+        return run
+
+    def pool_concurrent():
+        client.pool.close()
+        client.pool.max_idle = 8
+        client.api_request_many([ENDPOINT] * args.count, max_workers=8)
+
+    scenarios = (
+        ("urllib, new connection", urllib_fresh),
+        ("pool, no keep-alive", pool_sequential(0)),
+        ("pool, keep-alive", pool_sequential(8)),
+        ("pool, 8 workers", pool_concurrent),
+    )
+    results = {}
+    try:
+        for name, run in scenarios:
+            handshakes[0] = 0
+            stub.reset_stats()
+            started = time.perf_counter()
+            run()
+            seconds = time.perf_counter() - started
+            results[name] = {
+                "requests_per_s": args.count / seconds,
+                "ms_per_request": seconds * 1000 / args.count,
+                "handshakes": handshakes[0],
+                "errors": stub.totals()["errors"],
+            }
+    finally:
+        client.pool.close()
+        stub.stop()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{args.count} x GET {ENDPOINT} per scenario against {base_url}, latency {args.latency_ms:g} ms")
+    print(f"{'scenario':<24}{'req/s':>9}{'ms/req':>9}{'handshakes':>12}")
+    for name, r in results.items():
+        print(f"{name:<24}{r['requests_per_s']:>9.0f}{r['ms_per_request']:>9.2f}{r['handshakes']:>12}")
+
+
+if __name__ == "__main__":
+    main()
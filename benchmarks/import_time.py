@@ -0,0 +1,81 @@
+"""Import-time budget for plugin routes.
+
+Runs a route under ``python -X importtime`` with the stub xbmc modules and
+fails if it imports a module the route shouldn't need or its imports take
+longer than the budget:
+
+    python benchmarks/import_time.py                     # main menu
+    python benchmarks/import_time.py "mode=search" --budget-ms 80
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+from run_route import ROUTE_MARKER
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Modules the main menu must not load: it renders static items and never talks to the server
+MAIN_MENU_FORBIDDEN = (
+    "http.client",
+    "http.cookiejar",
+    "ssl",
+    "sqlite3",
+    "concurrent.futures",
+    "resources.lib.seerr_client",
+    "resources.lib.response_cache",
+    "resources.lib.media_dialog",
+    "resources.lib.library_index",
+)
+DEFAULT_BUDGET_MS = 25
+
+
+def measure(query):
+    """Returns ({module: self time in us}, total import time in ms) for one run of the route."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", os.path.join(BENCH_DIR, "run_route.py"), query],
+        capture_output=True, text=True, check=True,
+    )
+    modules = {}
+    lines = result.stderr.splitlines()
+    for line in lines[lines.index(ROUTE_MARKER) + 1:]:
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|", 2)
+        modules[name.strip()] = int(self_us)
+    return modules, sum(modules.values()) / 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("query", nargs="?", default="", help="plugin query string, empty for the main menu")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=10, help="slowest modules to list")
+    args = parser.parse_args()
+
+    timings = []
+    for _ in range(args.runs):
+        modules, total_ms = measure(args.query)
+        timings.append(total_ms)
+    median_ms = statistics.median(timings)
+
+    print(f"route: {args.query or '(main menu)'}")
+    print(f"imports: {len(modules)} modules, median {median_ms:.1f} ms over {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+    for name, self_us in sorted(modules.items(), key=lambda m: m[1], reverse=True)[:args.top]:
+        print(f"  {self_us / 1000:7.2f} ms  {name}")
+
+    failures = []
+    if not args.query:
+        failures += [f"main menu imports {name}" for name in MAIN_MENU_FORBIDDEN if name in modules]
+    if median_ms > args.budget_ms:
+        failures.append(f"median import time {median_ms:.1f} ms is over the {args.budget_ms:.0f} ms budget")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
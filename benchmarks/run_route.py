@@ -0,0 +1,65 @@
+"""Runs default.py once for a plugin query, the way Kodi does on each navigation.
+
+    python benchmarks/run_route.py "mode=trending&page=2" [--json]
+
+Uses the stub xbmc modules in benchmarks/stubs, so no Kodi is needed. With
+--json it prints the run time and what the route produced as one JSON line
+(used by bench_routes.py).
+"""
+import json
+import os
+import runpy
+import sys
+import time
+
+# Written to stderr right before default.py runs, so import_time.py can skip
+# interpreter startup and the stubs themselves
+ROUTE_MARKER = "-- kodiseerr route start --"
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ADDON_DIR = os.path.dirname(BENCH_DIR)
+
+
+def setup_path():
+    for path in (ADDON_DIR, os.path.join(BENCH_DIR, "stubs")):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+
+def run(query=""):
+    """Runs the route and returns {elapsed_ms, items, notifications, art, dialog}.
+
+    dialog is None, or {open_ms, loaded_ms} since the start of the route for
+    the first dialog it showed: when it opened, and when the threads it
+    started were done.
+    """
+    setup_path()
+    # Stubs stand in for modules Kodi has already loaded
+    import xbmc, xbmcaddon, xbmcgui, xbmcplugin, xbmcvfs  # noqa: F401
+    sys.stderr.write(ROUTE_MARKER + "\n")
+    sys.stderr.flush()
+    sys.argv = ["plugin://plugin.video.kodiseerr/", "1", "?" + query]
+    started = time.perf_counter()
+    try:
+        runpy.run_path(os.path.join(ADDON_DIR, "default.py"), run_name="__main__")
+    except SystemExit:
+        pass
+    dialog = None
+    if xbmcgui.DIALOG_TIMES:
+        opened, loaded = xbmcgui.DIALOG_TIMES[0]
+        dialog = {"open_ms": (opened - started) * 1000, "loaded_ms": (loaded - started) * 1000}
+    return {
+        "elapsed_ms": (time.perf_counter() - started) * 1000,
+        "items": len(xbmcplugin.ITEMS),
+        "notifications": [message for _, message in xbmcgui.NOTIFICATIONS],
+        "art": [item[1].art for item in xbmcplugin.ITEMS if getattr(item[1], "art", None)],
+        "dialog": dialog,
+    }
+
+
+if __name__ == "__main__":
+    arguments = [a for a in sys.argv[1:] if a != "--json"]
+    as_json = "--json" in sys.argv
+    result = run(arguments[0] if arguments else "")
+    if as_json:
+        print(json.dumps(result))
@@ -0,0 +1,388 @@
+"""Local stand-in for a Jellyseerr server.
+
+Emulates the endpoints the addon uses with seeded, reproducible data and
+configurable latency, payload size, error rate and response compression.
+The TMDB image proxy answers with filler images of realistic sizes.
+
+    python benchmarks/stub_server.py --port 5055 --latency-ms 40 --error-rate 0.02 --compression gzip
+
+The benchmarks start it in-process with StubServer(...).start().
+"""
+import argparse
+import json
+import os
+import random
+import re
+import shutil
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+API_PREFIX = "/api/v1"
+PAGE_SIZE = 20
+DISCOVER_PAGES = 25
+GENRES = [{"id": 28, "name": "Action"}, {"id": 35, "name": "Comedy"}, {"id": 18, "name": "Drama"},
+          {"id": 27, "name": "Horror"}, {"id": 878, "name": "Science Fiction"}, {"id": 10765, "name": "Sci-Fi & Fantasy"}]
+# Media statuses as Jellyseerr reports them
+PENDING, PROCESSING, PARTIAL, AVAILABLE = 2, 3, 4, 5
+CREW_JOBS = ("Director", "Producer", "Screenplay", "Editor", "Composer", "Director of Photography", "Casting")
+COMPRESSIONS = ("none", "gzip", "deflate")
+IMAGE_PREFIX = "/imageproxy/tmdb/t/p/"
+# Typical TMDB JPEG sizes in KB per (image kind, size bucket), for the image proxy
+IMAGE_KB = {
+    "poster": {"w92": 4, "w154": 8, "w185": 12, "w342": 32, "w500": 62, "w780": 130, "original": 900},
+    "backdrop": {"w300": 18, "w780": 85, "w1280": 210, "original": 1400},
+    "logo": {"w45": 2, "w92": 4, "w154": 7, "w185": 9, "w300": 15, "w500": 28, "original": 70},
+}
+
+
+def iso(timestamp):
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(timestamp)) + f".{int(timestamp * 1000) % 1000:03d}Z"
+
+
+class StubServer:
+    """Threaded stub server. stats counts requests, bytes and errors per endpoint shape."""
+
+    def __init__(self, port=0, latency_ms=0, jitter_ms=0, error_rate=0.0, payload_bytes=0,
+                 requests=500, https=False, seed=1, compression="none", credits=15):
+        self.port = port
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.payload_bytes = payload_bytes  # extra overview text per media item
+        self.compression = compression  # used when the client accepts it
+        self.credits = credits  # cast members per details page, with twice as many crew
+        self.https = https
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.sessions = set()
+        self.stats = {}
+        self.server = None
+        self.tempdir = None
+        now = time.time()
+        self.requests = {
+            i: {"id": i, "status": PENDING if i % 4 else AVAILABLE, "type": "movie" if i % 3 else "tv",
+                "createdAt": now - (requests - i) * 3600, "updatedAt": now - (requests - i) * 3600}
+            for i in range(1, requests + 1)
+        }
+
+    # -- data --------------------------------------------------------------
+
+    def media(self, media_id, media_type):
+        rng = random.Random(f"{media_type}{media_id}")
+        title = f"{'Movie' if media_type == 'movie' else 'Show'} {media_id}"
+        date = f"{rng.randint(1970, 2026)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        item = {
+            "id": media_id,
+            "mediaType": media_type,
+            "overview": f"Overview of {title}. " + "x" * self.payload_bytes,
+            "posterPath": f"/poster{media_id}.jpg",
+            "backdropPath": f"/backdrop{media_id}.jpg",
+            "voteAverage": round(rng.uniform(4, 9), 1),
+            "voteCount": rng.randint(10, 20000),
+            "genreIds": [g["id"] for g in rng.sample(GENRES, 2)],
+            "popularity": rng.uniform(1, 500),
+        }
+        if media_type == "movie":
+            item.update(title=title, releaseDate=date)
+        else:
+            item.update(name=title, firstAirDate=date)
+        return item
+
+    def details(self, media_id, media_type):
+        item = self.media(media_id, media_type)
+        rng = random.Random(f"details{media_type}{media_id}")
+        item.update(
+            genres=rng.sample(GENRES, 2),
+            tagline=f"Tagline {media_id}",
+            runtime=rng.randint(80, 180),
+            productionCountries=[{"iso_3166_1": "US", "name": "United States of America"}],
+            credits={
+                "cast": [{"id": n, "name": f"Actor {n}", "character": f"Role {n}", "order": n, "gender": n % 3,
+                          "creditId": "%024x" % rng.getrandbits(96), "profilePath": f"/profile{n}.jpg"}
+                         for n in range(self.credits)],
+                "crew": [{"id": 100, "name": "Director Name", "job": "Director", "department": "Directing"}] + [
+                    {"id": 1000 + n, "name": f"Crew {n}", "job": CREW_JOBS[n % len(CREW_JOBS)], "department": "Crew",
+                     "creditId": "%024x" % rng.getrandbits(96), "profilePath": f"/profile{1000 + n}.jpg"}
+                    for n in range(2 * self.credits)
+                ],
+            },
+            relatedVideos=[{"site": "YouTube", "key": "%011x" % rng.getrandbits(44), "name": f"Trailer {n}",
+                            "type": "Trailer", "url": f"https://www.youtube.com/watch?v={n}"} for n in range(5)],
+            mediaInfo={"tmdbId": media_id, "status": AVAILABLE if media_id % 4 == 0 else 1},
+        )
+        if media_type == "tv":
+            item["seasons"] = [{"seasonNumber": n, "name": f"Season {n}", "episodeCount": 10} for n in range(1, 6)]
+        return item
+
+    def page(self, page, media_type, total_pages=DISCOVER_PAGES, offset=0):
+        start = offset + (page - 1) * PAGE_SIZE
+        results = [self.media(start + i + 1, media_type) for i in range(PAGE_SIZE)] if page <= total_pages else []
+        return {"page": page, "totalPages": total_pages, "totalResults": total_pages * PAGE_SIZE, "results": results}
+
+    def request_item(self, request):
+        media_id = request["id"]
+        return {
+            "id": request["id"],
+            "type": request["type"],
+            "status": 2,
+            "createdAt": iso(request["createdAt"]),
+            "updatedAt": iso(request["updatedAt"]),
+            "media": {"id": media_id, "tmdbId": media_id, "mediaType": request["type"], "status": request["status"],
+                      "title" if request["type"] == "movie" else "name": f"Request {media_id}"},
+        }
+
+    def mark_available(self, request_id):
+        # Like Overseerr/Jellyseerr, only the media row changes; the request's updatedAt stays put
+        with self.lock:
+            self.requests[request_id]["status"] = AVAILABLE
+
+    def pending_ids(self):
+        with self.lock:
+            return [i for i, r in self.requests.items() if r["status"] in (PENDING, PROCESSING, PARTIAL)]
+
+    # -- routing -----------------------------------------------------------
+
+    def route(self, method, path, query, body):
+        """Returns (status, payload) for an API request."""
+        if path.startswith("/discover/"):
+            page = int(query.get("page", 1))
+            media_type = "tv" if path.startswith("/discover/tv") else "movie"
+            if path == "/discover/trending":
+                data = self.page(page, media_type)
+                for index, item in enumerate(data["results"]):
+                    if index % 3 == 2:
+                        data["results"][index] = self.media(item["id"], "tv")
+                return 200, data
+            genre = re.match(r"/discover/(movies|tv)/genre/(\d+)$", path)
+            return 200, self.page(page, media_type, offset=int(genre.group(2)) * 1000 if genre else 0)
+        if path in ("/genres/movie", "/genres/tv"):
+            return 200, GENRES
+        if path == "/search":
+            return 200, self.page(int(query.get("page", 1)), "movie", total_pages=3, offset=50000)
+        match = re.match(r"/(movie|tv)/(\d+)$", path)
+        if match:
+            return 200, self.details(int(match.group(2)), match.group(1))
+        if path == "/request" and method == "POST":
+            with self.lock:
+                request_id = max(self.requests) + 1
+                now = time.time()
+                self.requests[request_id] = {"id": request_id, "status": PENDING, "type": body.get("mediaType", "movie"),
+                                             "createdAt": now, "updatedAt": now}
+            return 201, self.request_item(self.requests[request_id])
+        if path == "/request":
+            return 200, self.request_list(query)
+        match = re.match(r"/request/(\d+)$", path)
+        if match:
+            request = self.requests.get(int(match.group(1)))
+            return (200, self.request_item(request)) if request else (404, {"message": "Request not found"})
+        return 404, {"message": "Not found"}
+
+    def request_list(self, query):
+        take, skip = int(query.get("take", 10)), int(query.get("skip", 0))
+        sort_field = "updatedAt" if query.get("sort") == "modified" else "createdAt"
+        with self.lock:
+            requests = list(self.requests.values())
+        if query.get("filter") == "processing":
+            requests = [r for r in requests if r["status"] in (PENDING, PROCESSING, PARTIAL)]
+        elif query.get("filter") == "available":
+            requests = [r for r in requests if r["status"] == AVAILABLE]
+        requests.sort(key=lambda r: r[sort_field], reverse=query.get("sortDirection", "desc") == "desc")
+        return {
+            "pageInfo": {"pages": -(-len(requests) // take), "pageSize": take, "results": len(requests), "page": skip // take + 1},
+            "results": [self.request_item(r) for r in requests[skip:skip + take]],
+        }
+
+    def image(self, path):
+        """Returns filler bytes sized like the TMDB image at path ("w342/poster12.jpg"), or None."""
+        match = re.match(r"(\w+)/(poster|backdrop|logo)\d*\.\w+$", path)
+        size_kb = match and IMAGE_KB[match.group(2)].get(match.group(1))
+        if not size_kb:
+            return None
+        return b"\xff\xd8\xff\xe0" + b"\0" * (size_kb * 1024 - 4)
+
+    def count(self, name, size=0, error=False):
+        with self.lock:
+            entry = self.stats.setdefault(name, {"requests": 0, "bytes": 0, "errors": 0})
+            entry["requests"] += 1
+            entry["bytes"] += size
+            entry["errors"] += error
+
+    def totals(self):
+        with self.lock:
+            return {
+                "requests": sum(s["requests"] for s in self.stats.values()),
+                "bytes": sum(s["bytes"] for s in self.stats.values()),
+                "errors": sum(s["errors"] for s in self.stats.values()),
+            }
+
+    def reset_stats(self):
+        with self.lock:
+            self.stats = {}
+
+    # -- server ------------------------------------------------------------
+
+    def start(self):
+        """Starts serving on a background thread and returns the base URL (without /api/v1)."""
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; with Nagle on, keep-alive
+            # responses would wait out the client's delayed ACK (~40 ms on Linux)
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def reply(self, name, status, payload, cookie=None):
+                body = json.dumps(payload).encode("utf-8")
+                accepted = [e.split(";")[0].strip() for e in (self.headers.get("Accept-Encoding") or "").split(",")]
+                encoding = stub.compression if stub.compression in accepted else None
+                if encoding == "gzip":
+                    compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+                    body = compressor.compress(body) + compressor.flush()
+                elif encoding == "deflate":
+                    body = zlib.compress(body, 6)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                if encoding:
+                    self.send_header("Content-Encoding", encoding)
+                self.send_header("Content-Length", str(len(body)))
+                if cookie:
+                    self.send_header("Set-Cookie", cookie)
+                self.end_headers()
+                # Counted before writing, so a client that has its answer never sees stale totals
+                stub.count(name, len(body), status >= 500)
+                self.wfile.write(body)
+
+            def reply_image(self, path):
+                image = stub.image(path)
+                if image is None:
+                    return self.reply("GET /imageproxy", 404, {"message": "Not found"})
+                self.send_response(200)
+                self.send_header("Content-Type", "image/jpeg")
+                self.send_header("Content-Length", str(len(image)))
+                self.end_headers()
+                stub.count(f"GET /imageproxy/{path.split('/')[0]}", len(image))
+                self.wfile.write(image)
+
+            def handle_api(self, method):
+                parts = urlsplit(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                delay = stub.latency_ms + (stub.random.uniform(-1, 1) * stub.jitter_ms if stub.jitter_ms else 0)
+                if delay > 0:
+                    time.sleep(delay / 1000)
+                if parts.path.startswith(IMAGE_PREFIX) and method == "GET":
+                    return self.reply_image(parts.path[len(IMAGE_PREFIX):])
+                if not parts.path.startswith(API_PREFIX):
+                    return self.reply("other", 404, {"message": "Not found"})
+                path = parts.path[len(API_PREFIX):]
+                name = f"{method} {re.sub(r'/[0-9]+(?=/|$)', '/{id}', path)}"
+
+                if path == "/auth/local" and method == "POST":
+                    token = "%032x" % stub.random.getrandbits(128)
+                    with stub.lock:
+                        stub.sessions.add(token)
+                    return self.reply(name, 200, {"id": 1, "email": "bench@example.com"},
+                                      f"connect.sid={token}; Path=/; HttpOnly; Max-Age=2592000")
+                cookies = dict(c.strip().split("=", 1) for c in (self.headers.get("Cookie") or "").split(";") if "=" in c)
+                if cookies.get("connect.sid") not in stub.sessions:
+                    return self.reply(name, 403, {"message": "You do not have permission to access this endpoint"})
+                if stub.error_rate and stub.random.random() < stub.error_rate:
+                    return self.reply(name, 500, {"message": "Injected error"})
+                try:
+                    body = json.loads(raw) if raw else {}
+                except ValueError:
+                    return self.reply(name, 400, {"message": "Invalid JSON"})
+                query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+                status, payload = stub.route(method, path, query, body)
+                self.reply(name, status, payload)
+
+            def do_GET(self):
+                self.handle_api("GET")
+
+            def do_POST(self):
+                self.handle_api("POST")
+
+        class Server(ThreadingHTTPServer):
+            # The default backlog of 5 drops connections a worker pool opens all at once,
+            # and the client only retries them after a second
+            request_queue_size = 64
+            daemon_threads = True
+
+        self.server = Server(("127.0.0.1", self.port), Handler)
+        scheme = "http"
+        if self.https:
+            scheme = "https"
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(*self._self_signed_cert())
+            self.server.socket = context.wrap_socket(self.server.socket, server_side=True)
+        self.port = self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, name="stub-seerr", daemon=True).start()
+        return f"{scheme}://127.0.0.1:{self.port}"
+
+    def _self_signed_cert(self):
+        if not shutil.which("openssl"):
+            raise RuntimeError("--https needs the openssl command to create a self-signed certificate")
+        self.tempdir = tempfile.mkdtemp(prefix="stub-seerr-")
+        cert, key = os.path.join(self.tempdir, "cert.pem"), os.path.join(self.tempdir, "key.pem")
+        subprocess.run(
+            ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1", "-subj", "/CN=127.0.0.1",
+             "-keyout", key, "-out", cert],
+            check=True, capture_output=True,
+        )
+        return cert, key
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+        if self.tempdir:
+            shutil.rmtree(self.tempdir, ignore_errors=True)
+
+
+def add_server_arguments(parser):
+    parser.add_argument("--latency-ms", type=float, default=0, help="delay added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="random +/- variation of the delay")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of API calls answered with HTTP 500")
+    parser.add_argument("--payload-bytes", type=int, default=0, help="extra overview text per media item")
+    parser.add_argument("--requests", type=int, default=500, help="number of seeded media requests")
+    parser.add_argument("--https", action="store_true", help="serve TLS with a throwaway self-signed certificate")
+    parser.add_argument("--compression", choices=COMPRESSIONS, default="none",
+                        help="compress responses when the client accepts it")
+    parser.add_argument("--credits", type=int, default=15, help="cast members per details page (crew is twice that)")
+    parser.add_argument("--seed", type=int, default=1)
+
+
+def server_from_arguments(args, port=0):
+    return StubServer(port=port, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+                      payload_bytes=args.payload_bytes, requests=args.requests, https=args.https, seed=args.seed,
+                      compression=args.compression, credits=args.credits)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub Jellyseerr server")
+    parser.add_argument("--port", type=int, default=5055)
+    add_server_arguments(parser)
+    args = parser.parse_args()
+    stub = server_from_arguments(args, args.port)
+    print(f"Serving on {stub.start()}{API_PREFIX} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Minimal stand-in for Kodi's xbmc module, enough to run the addon outside Kodi."""
+import json
+import os
+
+LOGDEBUG, LOGINFO, LOGWARNING, LOGERROR = 0, 1, 2, 3
+LOG = []
+BUILTINS = []
+# Info label values, e.g. {"System.ScreenHeight": "720"}; unknown labels are empty like in Kodi
+INFO_LABELS = json.loads(os.environ.get("KODISEERR_BENCH_INFO_LABELS") or "{}")
+
+
+def log(msg, level=LOGDEBUG):
+    LOG.append((level, msg))
+    if os.environ.get("KODISEERR_BENCH_VERBOSE"):
+        print(msg)
+
+
+def executebuiltin(command, wait=False):
+    BUILTINS.append(command)
+
+
+# Video library the VideoLibrary.* JSON-RPC methods answer from: movieid -> movie, tvshowid -> show,
+# each with the properties Kodi would return. Empty unless a benchmark fills it in.
+LIBRARY = {"movies": {}, "tvshows": {}}
+
+
+def executeJSONRPC(request):
+    call = json.loads(request)
+    method, params = call.get("method"), call.get("params") or {}
+    result = {}
+    if method == "VideoLibrary.GetMovies":
+        result = {"movies": list(LIBRARY["movies"].values())}
+    elif method == "VideoLibrary.GetTVShows":
+        result = {"tvshows": list(LIBRARY["tvshows"].values())}
+    elif method == "VideoLibrary.GetMovieDetails" and params.get("movieid") in LIBRARY["movies"]:
+        result = {"moviedetails": LIBRARY["movies"][params["movieid"]]}
+    elif method == "VideoLibrary.GetTVShowDetails" and params.get("tvshowid") in LIBRARY["tvshows"]:
+        result = {"tvshowdetails": LIBRARY["tvshows"][params["tvshowid"]]}
+    return json.dumps({"jsonrpc": "2.0", "id": 1, "result": result})
+
+
+def getInfoLabel(label):
+    return str(INFO_LABELS.get(label, ""))
+
+
+def sleep(ms):
+    pass
+
+
+class VirtualClock:
+    """Lets a benchmark run the service loop without really waiting.
+
+    waitForAbort() advances the clock instead of sleeping, and abortRequested()
+    turns true once it reaches the deadline. time.time() has to be patched to
+    now() by whoever installs it (see bench_service.py).
+    """
+
+    def __init__(self, duration, real_time):
+        self.real_time = real_time
+        self.offset = 0.0
+        self.started = real_time()
+        self.deadline = self.started + duration
+
+    def now(self):
+        return self.real_time() + self.offset
+
+    def advance(self, seconds):
+        self.offset += seconds
+
+
+# Installed by bench_service.py; plugin runs leave it unset
+CLOCK = None
+
+
+class Monitor:
+    def abortRequested(self):
+        return CLOCK is not None and CLOCK.now() >= CLOCK.deadline
+
+    def waitForAbort(self, timeout=0):
+        if CLOCK is not None:
+            CLOCK.advance(timeout or 0)
+        return self.abortRequested()
+
+
+class Player:
+    def isPlaying(self):
+        return False
+
+    def isPlayingVideo(self):
+        return False
+
+    def play(self, item=None, listitem=None):
+        pass
+
+
+class Actor:
+    def __init__(self, name="", role="", order=-1, thumbnail=""):
+        self.name = name
@@ -0,0 +1,33 @@
+"""Settings come from resources/settings.xml defaults, overridden by the
+KODISEERR_BENCH_SETTINGS environment variable (a JSON object) and SETTINGS."""
+import json
+import os
+import xml.etree.ElementTree as ET
+
+ADDON_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+SETTINGS = {
+    s.get("id"): s.get("default", "")
+    for s in ET.parse(os.path.join(ADDON_PATH, "resources", "settings.xml")).iter("setting")
+}
+SETTINGS["jellyseerr_url"] = os.environ.get("KODISEERR_BENCH_URL", "http://127.0.0.1:5055")
+SETTINGS.update(json.loads(os.environ.get("KODISEERR_BENCH_SETTINGS") or "{}"))
+
+
+class Addon:
+    def __init__(self, id=None):
+        pass
+
+    def getSetting(self, key):
+        return str(SETTINGS.get(key, ""))
+
+    def getSettingBool(self, key):
+        return str(SETTINGS.get(key, "false")).lower() == "true"
+
+    def getSettingInt(self, key):
+        return int(SETTINGS.get(key) or 0)
+
+    def setSetting(self, key, value):
+        SETTINGS[key] = value
+
+    def getAddonInfo(self, key):
+        return {"id": "plugin.video.kodiseerr", "path": ADDON_PATH}.get(key, "")
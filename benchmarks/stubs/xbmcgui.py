@@ -0,0 +1,163 @@
+import atexit
+import json
+import os
+import threading
+import time
+
+NOTIFICATION_INFO, NOTIFICATION_WARNING, NOTIFICATION_ERROR = "info", "warning", "error"
+
+# (heading, message) of every Dialog().notification() call
+NOTIFICATIONS = []
+
+
+class InfoTagVideo:
+    def __getattr__(self, name):
+        if not name.startswith("set"):
+            raise AttributeError(name)
+        return lambda *args, **kwargs: None
+
+
+class ListItem:
+    def __init__(self, label="", label2="", path="", offscreen=False):
+        self.label = label
+        self.properties = {}
+        self.art = {}
+        self.info_tag = InfoTagVideo()
+
+    def getVideoInfoTag(self):
+        return self.info_tag
+
+    def setArt(self, art):
+        self.art = art
+
+    def setProperty(self, key, value):
+        self.properties[key] = value
+
+    def getProperty(self, key):
+        return self.properties.get(key, "")
+
+    def setLabel(self, label):
+        self.label = label
+
+    def getLabel(self):
+        return self.label
+
+    def addContextMenuItems(self, items, replaceItems=False):
+        pass
+
+
+class DialogProgressBG:
+    def create(self, heading, message=""):
+        pass
+
+    def update(self, percent=0, heading=None, message=None):
+        pass
+
+    def close(self):
+        pass
+
+
+class Dialog:
+    def notification(self, heading, message, *args, **kwargs):
+        NOTIFICATIONS.append((heading, message))
+
+    def yesno(self, *args, **kwargs):
+        return False
+
+    def ok(self, *args, **kwargs):
+        return True
+
+    def select(self, *args, **kwargs):
+        return -1
+
+    def multiselect(self, heading, options, *args, **kwargs):
+        # KODISEERR_BENCH_MULTISELECT=all ticks every option, like a user requesting a whole page
+        if os.environ.get("KODISEERR_BENCH_MULTISELECT") == "all":
+            return list(range(len(options)))
+        return None
+
+    def input(self, *args, **kwargs):
+        return ""
+
+
+_WINDOW_PROPERTIES = {}
+# Kodi's windows outlive plugin invocations; with KODISEERR_BENCH_WINDOW_FILE set, their
+# properties are loaded from that JSON file on import and written back on exit
+_WINDOW_FILE = os.environ.get("KODISEERR_BENCH_WINDOW_FILE")
+if _WINDOW_FILE:
+    try:
+        with open(_WINDOW_FILE) as f:
+            _WINDOW_PROPERTIES.update({int(k): v for k, v in json.load(f).items()})
+    except (OSError, ValueError):
+        pass
+
+    @atexit.register
+    def _save_windows():
+        with open(_WINDOW_FILE, "w") as f:
+            json.dump(_WINDOW_PROPERTIES, f)
+
+
+class Window:
+    def __init__(self, window_id=0):
+        self.properties = _WINDOW_PROPERTIES.setdefault(window_id, {})
+
+    def getProperty(self, key):
+        return self.properties.get(key, "")
+
+    def setProperty(self, key, value):
+        self.properties[key] = value
+
+    def clearProperty(self, key):
+        self.properties.pop(key, None)
+
+
+class Control:
+    """Remembers what was set on it, for any control type."""
+
+    def __init__(self):
+        self.label = ""
+        self.text = ""
+        self.image = ""
+        self.visible = True
+
+    def setLabel(self, label):
+        self.label = label
+
+    def setText(self, text):
+        self.text = text
+
+    def setImage(self, image, useCache=True):
+        self.image = image
+
+    def setVisible(self, visible):
+        self.visible = visible
+
+
+# time.perf_counter() when a dialog was shown, and when the threads it started finished
+DIALOG_TIMES = []
+
+
+class WindowXMLDialog:
+    def __init__(self, *args, **kwargs):
+        self.controls = {}
+
+    def getControl(self, control_id):
+        return self.controls.setdefault(control_id, Control())
+
+    def onInit(self):
+        pass
+
+    def doModal(self):
+        """Shows the dialog, then stays open like a user reading it until the threads it started are done."""
+        running = set(threading.enumerate())
+        self.onInit()
+        opened = time.perf_counter()
+        for thread in set(threading.enumerate()) - running:
+            thread.join(30)
+        DIALOG_TIMES.append((opened, time.perf_counter()))
+
+    def show(self):
+        pass
+
+    def close(self):
+        pass
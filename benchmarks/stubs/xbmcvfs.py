@@ -0,0 +1,8 @@
+import os
+import tempfile
+
+DATA_ROOT = os.environ.get("KODISEERR_BENCH_DATA") or os.path.join(tempfile.gettempdir(), "kodiseerr-bench")
+
+
+def translatePath(path):
+    return path.replace("special://profile/addon_data/", DATA_ROOT.rstrip("/") + "/")
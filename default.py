@@ -1,4 +1,5 @@
 import sys
+import time
 import xbmc
 import xbmcplugin
 import xbmcgui
@@ -6,7 +7,7 @@ import xbmcaddon
 import urllib.parse
 import api_client
 import json
-from resources.lib.media_dialog import MediaDialog
+from resources.lib import poll_scheduler, prefetch, routes
 
 addon = xbmcaddon.Addon()
 addon_path = addon.getAddonInfo('path')
@@ -18,157 +19,177 @@ preferred_movie_view = int(addon.getSetting("view_mode_movies") or 0)
 preferred_tv_view = int(addon.getSetting("view_mode_tvshows") or 0)
 
 max_search_history = 10
-image_base_small = "https://image.tmdb.org/t/p/w500"
-image_base_large = "https://image.tmdb.org/t/p/original"
 enable_ask_4k = addon.getSettingBool('enable_ask_4k')
+highlight_owned = addon.getSettingBool('highlight_library_items')
+
+# Discover endpoints return 20 results per page; a screen can span several of them
+SERVER_PAGE_SIZE = 20
+SCREEN_SIZES = (20, 40, 60, 100)
+pages_per_screen = SCREEN_SIZES[int(addon.getSetting("items_per_screen") or 0)] // SERVER_PAGE_SIZE
+
+owned_titles = None
+artwork_policy = None
+
+# API image field -> (Kodi art types, artwork size kind), so make_art() is a single pass over a fixed table
+ART_FIELDS = (
+    ("posterPath", ("poster", "thumb"), "poster"),
+    ("backdropPath", ("fanart",), "fanart"),
+    ("logoPath", ("clearlogo",), "logo"),
+    ("bannerPath", ("banner",), "fanart"),
+    ("landscapePath", ("landscape",), "fanart"),
+    ("iconPath", ("icon",), "logo"),
+    ("clearartPath", ("clearart",), "logo"),
+)
+
+# Concurrent POSTs when requesting several titles at once; each makes the server call Radarr/Sonarr
+BATCH_REQUEST_WORKERS = 4
+# Failed titles named in the summary of a batch request
+BATCH_SUMMARY_FAILURES = 10
+
+# List item fields the media dialog shows while it loads the full details
+PREVIEW_FIELDS = ('title', 'name', 'posterPath', 'backdropPath', 'overview', 'releaseDate', 'firstAirDate', 'voteAverage')
+# The dialog's overview box shows a few lines; the details replace it with the full text
+PREVIEW_OVERVIEW_LENGTH = 500
+
+# info key -> InfoTagVideo setter, applied when the value is set
+INFO_SETTERS = (
+    ('title', 'setTitle'),
+    ('plot', 'setPlot'),
+    ('tagline', 'setTagLine'),
+    ('year', 'setYear'),
+    ('rating', 'setRating'),
+    ('votes', 'setVotes'),
+    ('premiered', 'setPremiered'),
+    ('duration', 'setDuration'),
+    ('mpaa', 'setMpaa'),
+    ('genres', 'setGenres'),
+    ('directors', 'setDirectors'),
+    ('studios', 'setStudios'),
+    ('countries', 'setCountries'),
+    ('mediatype', 'setMediaType'),
+    ('playcount', 'setPlaycount'),
+)
 
 def build_url(query):
     return base_url + '?' + urllib.parse.urlencode(query)
 
+def media_url(media_type, media_id, item):
+    """URL of the media dialog, carrying what the list already knows so the dialog can open without waiting."""
+    preview = {field: item[field] for field in PREVIEW_FIELDS if item.get(field)}
+    if len(preview.get('overview', '')) > PREVIEW_OVERVIEW_LENGTH:
+        preview['overview'] = preview['overview'][:PREVIEW_OVERVIEW_LENGTH].rstrip() + "..."
+    return build_url({
+        'mode': 'media',
+        'media_type': media_type,
+        'media_id': str(media_id),
+        'preview': json.dumps(preview, separators=(',', ':')),
+    })
+
+def get_artwork_policy():
+    global artwork_policy
+    if artwork_policy is None:
+        from resources.lib.artwork import ArtworkPolicy
+        artwork_policy = ArtworkPolicy.from_settings(addon, api_client.data_path(addon))
+    return artwork_policy
+
 def make_art(item):
     art = {}
-    for k in ["posterPath", "backdropPath", "logoPath", "bannerPath", "landscapePath", "iconPath", "clearartPath"]:
-        if item.get(k):
-            if k == "posterPath":
-                art["poster"] = image_base_small + item[k]
-                art["thumb"] = image_base_small + item[k]
-            elif k == "backdropPath":
-                art["fanart"] = image_base_large + item[k]
-            elif k == "logoPath":
-                art["clearlogo"] = image_base_small + item[k]
-            elif k == "bannerPath":
-                art["banner"] = image_base_small + item[k]
-            elif k == "landscapePath":
-                art["landscape"] = image_base_small + item[k]
-            elif k == "iconPath":
-                art["icon"] = image_base_small + item[k]
-            elif k == "clearartPath":
-                art["clearart"] = image_base_small + item[k]
+    policy = get_artwork_policy()
+    for field, art_types, kind in ART_FIELDS:
+        path = item.get(field)
+        if path:
+            url = policy.url(path, kind)
+            for art_type in art_types:
+                art[art_type] = url
     return art
 
-def make_info(item, media_type):
-    release_date = item.get('releaseDate') or item.get('firstAirDate')
-    year = int(release_date.split("-")[0]) if release_date and release_date.split("-")[0].isdigit() else 0
-    def join_names(obj_list):
-        return ', '.join(
-            g['name'] if isinstance(g, dict) and 'name' in g else str(g)
-            for g in obj_list
-        )
-    genres = join_names(item.get('genres', []))
-    studio = join_names(item.get('studios', [])) if item.get('studios') else ''
-    country = join_names(item.get('productionCountries', [])) if item.get('productionCountries') else ''
-    mpaa = item.get('certification', '')
-    runtime = item.get('runtime', 0)
+def get_owned_titles():
+    global owned_titles
+    if owned_titles is None:
+        # Written by the service; until it has, nothing is marked as owned
+        from resources.lib.library_index import OwnedTitles
+        owned_titles = OwnedTitles.load()
+    return owned_titles
+
+def find_in_library(item, media_type):
+    """Returns (library movie entry, library tvshowid) for a list item, looked up by TMDB id."""
+    owned = get_owned_titles()
+    tmdb_id = str(item.get('id') or '')
+    if media_type == 'movie':
+        return owned.find_movie(tmdb_id), None
+    if media_type == 'tv':
+        return None, owned.find_tvshow_id(tmdb_id)
+    return None, None
+
+def names(obj_list):
+    return [g['name'] if isinstance(g, dict) and 'name' in g else str(g) for g in obj_list or ()]
+
+def to_int(value):
     try:
-        runtime = int(runtime)
-    except Exception:
-        runtime = 0
-    try:
-        rating = float(item.get('voteAverage', 0))
-    except Exception:
-        rating = 0.0
-    votes = item.get('voteCount', 0)
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+def to_float(value):
     try:
-        votes = int(votes)
-    except Exception:
-        votes = 0
-    director = ', '.join([c['name'] for c in item.get('crew', []) if c.get('job') == 'Director']) if item.get('crew') else ''
-    cast = [person['name'] for person in item.get('cast', []) if isinstance(person, dict) and 'name' in person]
-    cast_str = ', '.join(cast[:5])
-    plot = item.get('overview', '')
-    title = item.get('title') or item.get('name')
-    # Rich plot for display
-    rich_plot = f"{title} ({year})"
-    if genres: rich_plot += f"\nGenres: {genres}"
-    if studio: rich_plot += f"\nStudio: {studio}"
-    if country: rich_plot += f"\nCountry: {country}"
-    if mpaa: rich_plot += f"\nCertification: {mpaa}"
-    if runtime: rich_plot += f"\nRuntime: {runtime} min"
-    if rating: rich_plot += f"\nRating: {rating} ({votes} votes)"
-    if director: rich_plot += f"\nDirector: {director}"
-    if cast_str: rich_plot += f"\nCast: {cast_str}"
-    if plot: rich_plot += f"\n\n{plot}"
-
-    info = {
-        'title': title or "",
-        'plot': rich_plot or "",
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+def make_info(item, media_type):
+    release_date = item.get('releaseDate') or item.get('firstAirDate') or ''
+    year = to_int(release_date.split("-")[0])
+    genres = names(item.get('genres'))
+    studios = names(item.get('studios'))
+    countries = names(item.get('productionCountries'))
+    mpaa = item.get('certification') or ''
+    runtime = to_int(item.get('runtime'))
+    rating = to_float(item.get('voteAverage'))
+    votes = to_int(item.get('voteCount'))
+    directors = [c['name'] for c in item.get('crew') or () if c.get('job') == 'Director']
+    cast = [person['name'] for person in item.get('cast') or () if isinstance(person, dict) and 'name' in person]
+    plot = item.get('overview') or ''
+    title = item.get('title') or item.get('name') or ''
+
+    # Rich plot for display, collected as lines and joined once
+    lines = [f"{title} ({year})"]
+    if genres: lines.append(f"Genres: {', '.join(genres)}")
+    if studios: lines.append(f"Studio: {', '.join(studios)}")
+    if countries: lines.append(f"Country: {', '.join(countries)}")
+    if mpaa: lines.append(f"Certification: {mpaa}")
+    if runtime: lines.append(f"Runtime: {runtime} min")
+    if rating: lines.append(f"Rating: {rating} ({votes} votes)")
+    if directors: lines.append(f"Director: {', '.join(directors)}")
+    if cast: lines.append(f"Cast: {', '.join(cast[:5])}")
+    if plot: lines.append(f"\n{plot}")
+
+    return {
+        'title': title,
+        'plot': "\n".join(lines),
         'year': year,
-        'genre': genres or "",
+        'genres': genres,
         'rating': rating,
         'votes': votes,
-        'premiered': release_date or "",
+        'premiered': release_date,
         'duration': runtime,
-        'mpaa': mpaa or "",
+        'mpaa': mpaa,
         'cast': cast,
-        'director': director or "",
-        'studio': studio or "",
-        'country': country or "",
+        'directors': directors,
+        'studios': studios,
+        'countries': countries,
         'mediatype': media_type
     }
-    return info
 
 def set_info_tag(list_item, info):
     info_tag = list_item.getVideoInfoTag()
-
-    # Safe InfoTagVideo setters
-    if info.get('title'):
-        info_tag.setTitle(info['title'])
-    if info.get('plot'):
-        info_tag.setPlot(info['plot'])
-    if info.get('year'):
-        try:
-            info_tag.setYear(int(info['year']))
-        except Exception:
-            pass
-    if info.get('rating'):
-        try:
-            info_tag.setRating(float(info['rating']))
-        except Exception:
-            pass
-    if info.get('votes'):
-        try:
-            info_tag.setVotes(int(info['votes']))
-        except Exception:
-            pass
-    if info.get('premiered'):
-        info_tag.setPremiered(info['premiered'])
-    if info.get('duration'):
-        try:
-            info_tag.setDuration(int(info['duration']))
-        except Exception:
-            pass
-    if info.get('mpaa'):
-        info_tag.setMpaa(info['mpaa'])
-    if info.get('director'):
-        info_tag.setDirector(info['director'])
-    if info.get('studio'):
-        info_tag.setStudio(info['studio'])
-
-    # Fallback to setInfo for unsupported InfoTagVideo attributes
-    fallback_info = {}
-    if info.get('genre'):
-        fallback_info['genre'] = info['genre']
+    for key, setter in INFO_SETTERS:
+        value = info.get(key)
+        if value:
+            getattr(info_tag, setter)(value)
     if info.get('cast'):
-        fallback_info['cast'] = info['cast']
-    if info.get('country'):
-        fallback_info['country'] = info['country']
-    if info.get('mediatype'):
-        fallback_info['mediatype'] = info['mediatype']
-
-    if fallback_info:
-        list_item.setInfo('video', fallback_info)
-
-def render_media_items(items, current_page=1, total_pages=1, mode=None, genre_id=None, display_type=None):
-    # Determine Kodi content type based on mode or display_type
-    if mode in ['popular_movies', 'upcoming_movies']:
-        content_type = 'movies'
-    elif mode in ['popular_tv', 'upcoming_tv']:
-        content_type = 'tvshows'
-    elif mode == 'genre':
-        content_type = 'movies' if display_type == 'movies' else 'tvshows'
-    else:
-        content_type = 'movies'
+        info_tag.setCast([xbmc.Actor(name) for name in info['cast']])
 
+def render_media_items(items, current_page=1, total_pages=1, mode=None, content_type='movies', route_args=None):
     if content_type == 'movies' and preferred_movie_view:
         xbmc.executebuiltin(f'Container.SetViewMode({preferred_movie_view})')
     elif content_type == 'tvshows' and preferred_tv_view:
@@ -176,72 +197,77 @@ def render_media_items(items, current_page=1, total_pages=1, mode=None, genre_id
 
     xbmcplugin.setContent(addon_handle, content_type)
 
+    # Everything is collected first and handed to Kodi in one addDirectoryItems call
+    entries = []
+
     # Show page info if pagination exists
     if total_pages > 1:
-        page_info = xbmcgui.ListItem(label=f'[I]Page {current_page} of {total_pages}[/I]')
-        xbmcplugin.addDirectoryItem(addon_handle, '', page_info, False)
+        page_info = xbmcgui.ListItem(label=f'[I]Page {current_page} of {total_pages}[/I]', offscreen=True)
+        entries.append(('', page_info, False))
 
         # Previous Page
         if current_page > 1:
-            params = {'mode': mode, 'page': current_page - 1}
-            if mode == "genre":
-                params['genre_id'] = genre_id
-                params['display_type'] = display_type
-            prev_page_url = build_url(params)
-            prev_item = xbmcgui.ListItem(label=f'[B]<< Previous Page ({current_page - 1})[/B]')
-            xbmcplugin.addDirectoryItem(addon_handle, prev_page_url, prev_item, True)
+            prev_page_url = build_url(dict(route_args or {}, mode=mode, page=current_page - 1))
+            prev_item = xbmcgui.ListItem(label=f'[B]<< Previous Page ({current_page - 1})[/B]', offscreen=True)
+            entries.append((prev_page_url, prev_item, True))
+
+    # Lists of the route table can be requested from in one go
+    batch_url = None
+    if mode in routes.LIST_ROUTES and routes.LIST_ROUTES[mode].view == 'media':
+        batch_url = build_url(dict(route_args or {}, mode='request_multiple', list_mode=mode, page=current_page))
+        batch_item = xbmcgui.ListItem(label='[B][COLOR yellow]Request multiple...[/COLOR][/B]', offscreen=True)
+        entries.append((batch_url, batch_item, False))
 
     # Media Items
     for item in items:
         id = item.get('id')
         media_type = item.get('mediaType', 'movie')
-        title = item.get('title') or item.get('name') or "Untitled"
-        release_date = item.get('releaseDate') or item.get('firstAirDate')
-        year = int(release_date.split("-")[0]) if release_date and release_date.split("-")[0].isdigit() else None
-        label = f"{title} ({year})" if year else title
-
-        url = build_url({
-            'mode': 'media',
-            'media_type': media_type,
-            'media_id': str(id),
-        })
-
-        # url = build_url({'mode': 'list_seasons', 'id': item['id']}) if media_type == 'tv' else \
-        #     build_url({'mode': 'request', 'type': 'movie', 'id': item['id']})
-
-        list_item = xbmcgui.ListItem(label=label)
         info = make_info(item, media_type)
-        art = make_art(item)
+        title = info['title'] or "Untitled"
+        label = f"{title} ({info['year']})" if info['year'] else title
+
+        url = media_url(media_type, id, item)
+
+        owned_movie, owned_show = find_in_library(item, media_type) if highlight_owned else (None, None)
+        if owned_movie or owned_show is not None:
+            label = f"[COLOR lime]{label}[/COLOR]"
+
+        list_item = xbmcgui.ListItem(label=label, offscreen=True)
+        context_menu = []
+        if owned_movie:
+            info['playcount'] = owned_movie.get('playcount', 0)
+            list_item.setProperty('kodiseerr.in_library', 'true')
+            list_item.setProperty('kodiseerr.library_file', owned_movie['file'])
+            # Quoted so commas and parentheses in the path don't split the builtin's arguments
+            file_arg = owned_movie['file'].replace('"', '\\"')
+            context_menu.append(('Play from library', f'PlayMedia("{file_arg}")'))
+        elif owned_show is not None:
+            list_item.setProperty('kodiseerr.in_library', 'true')
+            context_menu.append(('Open in library', f"ActivateWindow(Videos,videodb://tvshows/titles/{owned_show}/,return)"))
+        if batch_url:
+            context_menu.append(('Request multiple...', f"RunPlugin({batch_url})"))
+        if context_menu:
+            list_item.addContextMenuItems(context_menu)
         set_info_tag(list_item, info)
-        list_item.setArt(art)
-        xbmcplugin.addDirectoryItem(addon_handle, url, list_item, True)
+        list_item.setArt(make_art(item))
+        entries.append((url, list_item, True))
 
     # Next Page
     if total_pages > 1 and current_page < total_pages:
-        params = {'mode': mode, 'page': current_page + 1}
-        if mode == "genre":
-            params['genre_id'] = genre_id
-            params['display_type'] = display_type
-        next_page_url = build_url(params)
-        next_item = xbmcgui.ListItem(label=f'[B]Next Page ({current_page + 1}) >>[/B]')
-        xbmcplugin.addDirectoryItem(addon_handle, next_page_url, next_item, True)
+        next_page_url = build_url(dict(route_args or {}, mode=mode, page=current_page + 1))
+        next_item = xbmcgui.ListItem(label=f'[B]Next Page ({current_page + 1}) >>[/B]', offscreen=True)
+        entries.append((next_page_url, next_item, True))
 
+    xbmcplugin.addDirectoryItems(addon_handle, entries, len(entries))
     xbmcplugin.endOfDirectory(addon_handle)
 
 def list_main_menu():
-    xbmcplugin.addDirectoryItem(addon_handle, build_url({'mode': 'trending'}), xbmcgui.ListItem('Trending'), True)
-    xbmcplugin.addDirectoryItem(addon_handle, build_url({'mode': 'popular_movies'}), xbmcgui.ListItem('Popular Movies'), True)
-    xbmcplugin.addDirectoryItem(addon_handle, build_url({'mode': 'popular_tv'}), xbmcgui.ListItem('Popular TV Shows'), True)
-    xbmcplugin.addDirectoryItem(addon_handle, build_url({'mode': 'upcoming_movies'}), xbmcgui.ListItem('Upcoming Movies'), True)
-    xbmcplugin.addDirectoryItem(addon_handle, build_url({'mode': 'upcoming_tv'}), xbmcgui.ListItem('Upcoming TV Shows'), True)
-    xbmcplugin.addDirectoryItem(addon_handle, build_url({'mode': 'genres', 'media_type': 'movie'}), xbmcgui.ListItem('Movies by Genre'), True)
-    xbmcplugin.addDirectoryItem(addon_handle, build_url({'mode': 'genres', 'media_type': 'tv'}), xbmcgui.ListItem('TV Shows by Genre'), True)
-    xbmcplugin.addDirectoryItem(addon_handle, build_url({'mode': 'requests'}), xbmcgui.ListItem('Request Progress'), True)
-    xbmcplugin.addDirectoryItem(addon_handle, build_url({'mode': 'search'}), xbmcgui.ListItem('Search'), True)
+    for label, mode, menu_args in routes.MAIN_MENU:
+        xbmcplugin.addDirectoryItem(addon_handle, build_url(dict(menu_args, mode=mode)), xbmcgui.ListItem(label), True)
     xbmcplugin.endOfDirectory(addon_handle)
 
-def list_genres(media_type):
-    data = api_client.client.api_request(f"/genres/{media_type}", params={})
+def list_genres(data, mode, route, route_args):
+    media_type = route_args['media_type']
     for item in data:
         name = item.get('name')
         id = item.get('id')
@@ -251,7 +277,50 @@ def list_genres(media_type):
         xbmcplugin.addDirectoryItem(addon_handle, url, list_item, True)
     xbmcplugin.endOfDirectory(addon_handle)
 
-def list_items(data, mode, display_type=None, genre_id=None):
+def merge_pages(pages, screen):
+    """Joins the server pages of one screen, dropping items repeated by a later page."""
+    pages = [p for p in pages if isinstance(p, dict)]
+    if not pages:
+        return None
+    total_pages = max(to_int(data.get('totalPages')) for data in pages) or 1
+    # The last screen of a list may ask for pages past its end
+    pages = [data for data in pages if to_int(data.get('page')) <= total_pages]
+    seen = set()
+    results = []
+    for data in pages:
+        for item in data.get('results', []):
+            key = (item.get('mediaType'), item.get('id'))
+            if key not in seen:
+                seen.add(key)
+                results.append(item)
+    return {
+        'page': screen,
+        'totalPages': -(-total_pages // pages_per_screen),
+        'serverTotalPages': total_pages,
+        'results': results,
+    }
+
+def fetch_list(endpoint, params, ttl=None):
+    """Fetches one screen of a paged list; its server pages are requested in parallel."""
+    screen = to_int(params.get('page')) or 1
+    first_page = (screen - 1) * pages_per_screen + 1
+    if pages_per_screen == 1:
+        data = api_client.client.api_request(endpoint, params=params, ttl=ttl)
+        total_pages = data and data.get('totalPages', 1)
+    else:
+        data = merge_pages(api_client.client.api_request_many([
+            {'endpoint': endpoint, 'params': dict(params, page=first_page + i), 'ttl': ttl}
+            for i in range(pages_per_screen)
+        ]), screen)
+        total_pages = data and data['serverTotalPages']
+    if data and api_client.cache:
+        # Leave a hint for service.py to warm the next screen while this one is shown
+        last_page = min(first_page + pages_per_screen - 1, total_pages)
+        prefetch.remember_list(api_client.cache, endpoint, params, last_page, total_pages, pages_per_screen, ttl)
+        xbmc.executebuiltin(f"NotifyAll({addon.getAddonInfo('id')},{prefetch.WAKE_MESSAGE})")
+    return data
+
+def list_items(data, mode, route, route_args):
     items = data.get('results', [])
     current_page = data.get('page', 1)
     total_pages = data.get('totalPages', 1)
@@ -261,15 +330,14 @@ def list_items(data, mode, display_type=None, genre_id=None):
         current_page=current_page,
         total_pages=total_pages,
         mode=mode,
-        genre_id=genre_id,
-        display_type=display_type
+        content_type=route.content_type(route_args),
+        route_args=route_args
     )
 
-def do_request(media_type, id):
-    is4k = False
-    if enable_ask_4k:
-        if xbmcgui.Dialog().yesno('KodiSeerr', 'Request in 4K quality?'):
-            is4k = True
+def ask_4k():
+    return enable_ask_4k and xbmcgui.Dialog().yesno('KodiSeerr', 'Request in 4K quality?')
+
+def request_payload(media_type, id, is4k):
     payload = {
         "mediaType": media_type,
         "mediaId": int(id),
@@ -277,18 +345,26 @@ def do_request(media_type, id):
     }
     if media_type == "tv":
         payload["seasons"] = "all"
+    return payload
+
+def notify_request_sent():
+    """Lets the service switch back to fast polling so the availability notice isn't delayed."""
+    xbmc.executebuiltin(f"NotifyAll({addon.getAddonInfo('id')},{poll_scheduler.REQUEST_SENT_MESSAGE})")
+
+def do_request(media_type, id):
+    payload = request_payload(media_type, id, ask_4k())
     try:
         xbmcgui.Dialog().notification('KodiSeerr', 'Processing Request...', xbmcgui.NOTIFICATION_INFO, 3000)
         api_client.client.api_request("/request", method="POST", data=payload)
+        # The shared details still show the old status
+        api_client.client.forget(f"/{media_type}/{id}")
+        notify_request_sent()
         xbmcgui.Dialog().notification('KodiSeerr', 'Request Sent!', xbmcgui.NOTIFICATION_INFO, 3000)
     except Exception as e:
         xbmcgui.Dialog().notification('KodiSeerr', f'Request Failed: {str(e)}', xbmcgui.NOTIFICATION_ERROR, 4000)
 
 def do_request_seasons(tv_id, selected_seasons):
-    is4k = False
-    if enable_ask_4k:
-        if xbmcgui.Dialog().yesno('KodiSeerr', 'Request in 4K quality?'):
-            is4k = True
+    is4k = ask_4k()
 
     # Build the payload with all selected seasons
     payload = {
@@ -301,6 +377,8 @@ def do_request_seasons(tv_id, selected_seasons):
     try:
         xbmcgui.Dialog().notification('KodiSeerr', 'Processing Request...', xbmcgui.NOTIFICATION_INFO, 3000)
         api_client.client.api_request("/request", method="POST", data=payload)
+        api_client.client.forget(f"/tv/{tv_id}")
+        notify_request_sent()
         xbmcgui.Dialog().notification(
             'KodiSeerr',
             f'Request sent for seasons: {", ".join(map(str, selected_seasons))}',
@@ -315,7 +393,60 @@ def do_request_seasons(tv_id, selected_seasons):
             4000
         )
 
-def show_requests(data, mode):
+def request_multiple(list_mode):
+    """Lets the user tick titles of one list screen and requests them all, a few POSTs at a time."""
+    route = routes.LIST_ROUTES.get(list_mode)
+    if not route or route.view != 'media':
+        return
+    route_args = {name: args.get(name) for name in route.args}
+    data = fetch_route(route, route_args, args.get('page') or 1)
+    # Only movies and shows can be requested (search results include people), and titles the server
+    # already knows about (requested, processing, available) can't be requested again
+    items = [
+        item for item in (data or {}).get('results', [])
+        if item.get('id') and item.get('mediaType') in ('movie', 'tv')
+        and to_int((item.get('mediaInfo') or {}).get('status')) < 2
+    ]
+    if not items:
+        xbmcgui.Dialog().notification('KodiSeerr', 'Nothing left to request on this page', xbmcgui.NOTIFICATION_INFO)
+        return
+    labels = []
+    for item in items:
+        info = make_info(item, item['mediaType'])
+        title = info['title'] or "Untitled"
+        labels.append(f"{title} ({info['year']})" if info['year'] else title)
+    selected = xbmcgui.Dialog().multiselect("Select titles to request", labels)
+    if not selected:
+        return
+    chosen = [(items[i], labels[i]) for i in selected if 0 <= i < len(items)]
+    is4k = ask_4k()
+
+    progress = xbmcgui.DialogProgressBG()
+    progress.create('KodiSeerr', f"Requesting {len(chosen)} titles...")
+    try:
+        results = api_client.client.api_request_many(
+            [{'endpoint': '/request', 'method': 'POST',
+              'data': request_payload(item['mediaType'], item['id'], is4k)} for item, _ in chosen],
+            max_workers=BATCH_REQUEST_WORKERS,
+            progress=lambda done, total: progress.update(100 * done // total, message=f"{done} of {total} sent"),
+        )
+    finally:
+        progress.close()
+
+    failed = [label for (_, label), result in zip(chosen, results) if result is None]
+    for (item, _), result in zip(chosen, results):
+        if result is not None:
+            api_client.client.forget(f"/{item['mediaType']}/{item['id']}")
+    if len(failed) < len(chosen):
+        notify_request_sent()
+    summary = f"Requested {len(chosen) - len(failed)} of {len(chosen)} titles."
+    if failed:
+        summary += "\n[COLOR red]Failed:[/COLOR] " + ", ".join(failed[:BATCH_SUMMARY_FAILURES])
+        if len(failed) > BATCH_SUMMARY_FAILURES:
+            summary += f" and {len(failed) - BATCH_SUMMARY_FAILURES} more"
+    xbmcgui.Dialog().ok('KodiSeerr', summary)
+
+def show_requests(data, mode, route, route_args):
     items = data.get('results', [])
 
     status_map = {
@@ -324,15 +455,22 @@ def show_requests(data, mode):
         5: "[COLOR lime](Available)[/COLOR]"
     }
 
-    for item in items:
-        media = item.get('media', {})
-        if not media or not media.get('tmdbId') or not media.get('mediaType'):
-            continue
+    medias = [
+        item.get('media') for item in items
+        if item.get('media') and item['media'].get('tmdbId') and item['media'].get('mediaType')
+    ]
+    # Hydrate every request's details in parallel instead of one round-trip at a time
+    details = api_client.client.api_request_many(
+        [{'endpoint': f"/{m['mediaType']}/{m['tmdbId']}", 'params': {}} for m in medias]
+    )
 
+    for media, mediaData in zip(medias, details):
         id = media.get('tmdbId')
         media_type = media.get('mediaType')
 
-        mediaData = api_client.client.api_request(f"/{media_type}/{id}", params={})
+        if not mediaData:
+            xbmc.log(f"[kodiseerr] Skipping request {media_type}/{id}: details unavailable", xbmc.LOGWARNING)
+            continue
 
         title = mediaData.get('title') or mediaData.get('name') or f"ID {id}"
         overview = mediaData.get('overview', '')
@@ -345,11 +483,7 @@ def show_requests(data, mode):
         status = media.get('status')
         label_text = f"{title} {status_map.get(status, '')}"
 
-        url = build_url({
-            'mode': 'media',
-            'media_type': media_type,
-            'media_id': str(id),
-        })
+        url = media_url(media_type, id, mediaData)
 
         list_item = xbmcgui.ListItem(label=label_text)
 
@@ -357,7 +491,7 @@ def show_requests(data, mode):
             'title': title,
             'plot': f"{overview}\n\nGenres: {genres}\nRuntime: {runtime} min\nRating: {vote}\nRelease: {release_date}",
             'tagline': tagline,
-            'genre': genres,
+            'genres': names(mediaData.get('genres')),
             'duration': runtime,
             'rating': vote,
             'year': int(release_date.split('-')[0]) if release_date else None
@@ -370,19 +504,30 @@ def show_requests(data, mode):
         xbmcplugin.addDirectoryItem(addon_handle, url, list_item, isFolder=True)
     xbmcplugin.endOfDirectory(addon_handle)
 
-def launch_media_dialog(mediaData):
+def with_dialog_art(mediaData):
+    """Copy of mediaData with the poster and fanart URLs the media dialog shows."""
     media = mediaData.copy()
+    policy = get_artwork_policy()
+    poster_path, backdrop_path = mediaData.get('posterPath'), mediaData.get('backdropPath')
     media.update({
         'title': mediaData.get('title') or mediaData.get('name', 'Unknown Title'),
-        'poster': image_base_small + mediaData.get('posterPath', ''),
-        'fanart': image_base_large + mediaData.get('backdropPath', '')
+        'poster': policy.url(poster_path, 'poster') if poster_path else '',
+        'fanart': policy.url(backdrop_path, 'fanart') if backdrop_path else ''
     })
+    return media
+
+def launch_media_dialog(mediaData, loader=None):
+    """Shows the media dialog. With a loader, mediaData is a preview and the dialog loads the details itself."""
+    # The dialog's window classes are only needed on this route
+    from resources.lib.media_dialog import MediaDialog
+    media = with_dialog_art(mediaData)
     dialog = MediaDialog(
         'MediaDetailDialog.xml',
         addon_path,
         'Default',
         '720p',
         media=media,
+        loader=loader,
     )
     dialog.doModal()
     del dialog
@@ -490,68 +635,126 @@ def search(query=None):
 
     render_media_items(data.get('results', []))  # No pagination info needed here
 
-mode = args.get('mode')
-page = args.get('page')
-if not page:
-    page = 1
-if not mode:
-    list_main_menu()
-elif mode == "trending":
-    data = api_client.client.api_request("/discover/trending", params={"page": page})
-    if data:
-        list_items(data, mode)
-    else:
-        xbmcgui.Dialog().notification("Kodiseerr", "API Error", xbmcgui.NOTIFICATION_ERROR)
-elif mode == "popular_movies":
-    data = api_client.client.api_request("/discover/movies", params={"sortBy": "popularity.desc", "page": page})
-    if data:
-        list_items(data, mode)
-    else:
-        xbmcgui.Dialog().notification("Kodiseerr", "API Error", xbmcgui.NOTIFICATION_ERROR)
-elif mode == "popular_tv":
-    data = api_client.client.api_request("/discover/tv", params={"sortBy": "popularity.desc", "page": page})
-    if data:
-        list_items(data, mode)
-    else:
-        xbmcgui.Dialog().notification("Kodiseerr", "API Error", xbmcgui.NOTIFICATION_ERROR)
-elif mode == "upcoming_movies":
-    data = api_client.client.api_request("/discover/movies/upcoming", params={"page": page})
-    if data:
-        list_items(data, mode)
-    else:
-        xbmcgui.Dialog().notification("Kodiseerr", "API Error", xbmcgui.NOTIFICATION_ERROR)
-elif mode == "upcoming_tv":
-    data = api_client.client.api_request("/discover/tv/upcoming", params={"page": page})
-    if data:
-        list_items(data, mode)
-    else:
-        xbmcgui.Dialog().notification("Kodiseerr", "API Error", xbmcgui.NOTIFICATION_ERROR)
-elif mode == "search":
-    search()
-elif mode == "request":
-    do_request(args.get('type'), args.get('id'))
-elif mode == "requests":
-    data = api_client.client.api_request('/request', params={'sort': 'added', 'filter': 'all', 'sortDirection': 'desc', 'take': 25})
+def open_media(media_type, media_id):
+    try:
+        preview = json.loads(args.get('preview') or '{}')
+    except ValueError:
+        preview = {}
+    # Opens straight away from the list's data, the details follow from a background thread
+    endpoint = f"/{media_type}/{media_id}"
+
+    def load_details():
+        details = api_client.client.api_request(endpoint, params={})
+        return with_dialog_art(details) if details else details
+    launch_media_dialog(preview, loader=load_details)
+    sys.exit()
+
+def clear_cache():
+    if api_client.cache:
+        api_client.cache.clear()
+    xbmcgui.Dialog().notification("KodiSeerr", "Cache cleared", xbmcgui.NOTIFICATION_INFO, 3000)
+
+def show_diagnostics():
+    """Lists p50/p95 timings per endpoint and route over the last week, slowest first."""
+    metrics = api_client.metrics
+    if not metrics:
+        xbmcgui.Dialog().notification("KodiSeerr", "Request timings are turned off in the settings", xbmcgui.NOTIFICATION_INFO, 3000)
+        xbmcplugin.endOfDirectory(addon_handle)
+        return
+    summary = metrics.summary()
+    if not summary:
+        xbmcgui.Dialog().notification("KodiSeerr", "No timings recorded yet", xbmcgui.NOTIFICATION_INFO, 3000)
+
+    def slowest(entry):
+        timing = entry[1]['metrics'].get('total') or entry[1]['metrics'].get('cached') or (0, 0, 0)
+        return timing[2]
+
+    for name, stats in sorted(summary.items(), key=slowest, reverse=True):
+        timings, events = stats['metrics'], stats['events']
+        label = name
+        total = timings.get('total') or timings.get('cached')
+        if total:
+            label += f"  [COLOR grey]p50 {total[1]:.0f} ms, p95 {total[2]:.0f} ms[/COLOR]"
+        calls = events.get('network', 0) + events.get('cache hit', 0)
+        if calls:
+            label += f"  [COLOR grey]({calls} calls, {100 * events.get('cache hit', 0) // calls}% cached)[/COLOR]"
+
+        lines = [f"{metric}: p50 {p50:.0f}, p95 {p95:.0f} ({count} samples)" for metric, (count, p50, p95) in sorted(timings.items())]
+        lines += [f"{event}: {count}" for event, count in sorted(events.items())]
+        list_item = xbmcgui.ListItem(label=label, offscreen=True)
+        list_item.getVideoInfoTag().setPlot("\n".join(lines))
+        xbmcplugin.addDirectoryItem(addon_handle, '', list_item, isFolder=False)
+
+    clear_item = xbmcgui.ListItem(label='[B]Clear timings[/B]')
+    xbmcplugin.addDirectoryItem(addon_handle, build_url({'mode': 'clear_diagnostics'}), clear_item, isFolder=False)
+    xbmcplugin.endOfDirectory(addon_handle)
+
+def clear_diagnostics():
+    if api_client.metrics:
+        api_client.metrics.clear()
+    xbmc.executebuiltin('Container.Refresh')
+
+def request_seasons(tv_id, seasons):
+    do_request_seasons(int(tv_id), json.loads(seasons))
+
+# Renderers for routes.LIST_ROUTES, by the route's view
+VIEWS = {
+    'media': list_items,
+    'genres': list_genres,
+    'requests': show_requests,
+}
+
+# mode -> (handler, plugin arguments passed to it, all required)
+ACTIONS = {
+    'search': (search, ()),
+    'request': (do_request, ('type', 'id')),
+    'list_seasons': (list_seasons, ('id',)),
+    'request_seasons': (request_seasons, ('tv_id', 'seasons')),
+    'request_multiple': (request_multiple, ('list_mode',)),
+    'clear_cache': (clear_cache, ()),
+    'media': (open_media, ('media_type', 'media_id')),
+    'diagnostics': (show_diagnostics, ()),
+    'clear_diagnostics': (clear_diagnostics, ()),
+}
+
+def fetch_route(route, route_args, page=1):
+    endpoint, params = route.resolve(route_args, page)
+    if route.paged:
+        return fetch_list(endpoint, params, route.ttl)
+    return api_client.client.api_request(endpoint, params=params, ttl=route.ttl)
+
+def show_list(mode, route):
+    started = time.monotonic()
+    route_args = {name: args.get(name) for name in route.args}
+    if not all(route_args.values()):
+        xbmc.log(f"[kodiseerr] Missing arguments for {mode}: {args}", xbmc.LOGWARNING)
+        return
+    data = fetch_route(route, route_args, args.get('page') or 1)
     if data:
-        show_requests(data, mode)
+        VIEWS[route.view](data, mode, route, route_args)
+    elif api_client.client.breaker.is_open:
+        retry_in = api_client.client.breaker.retry_in()
+        xbmcgui.Dialog().notification("Kodiseerr", f"Server unreachable, retrying in {retry_in:.0f}s",
+                                      xbmcgui.NOTIFICATION_ERROR)
     else:
         xbmcgui.Dialog().notification("Kodiseerr", "API Error", xbmcgui.NOTIFICATION_ERROR)
-elif mode == "list_seasons" and args.get("id"):
-    list_seasons(args.get("id"))
-elif mode == 'request_seasons' and args.get("tv_id") and args.get("seasons"):
-    tv_id = int(args.get("tv_id"))
-    selected = json.loads(args.get("seasons"))
-    do_request_seasons(tv_id, selected)
-elif mode == "genres" and args.get("media_type"):
-    list_genres(args.get("media_type"))
-elif mode == "genre" and args.get("display_type") and args.get("genre_id"):
-    display_type = args.get("display_type")
-    genre_id = args.get("genre_id")
-    data = api_client.client.api_request(f"/discover/{display_type}/genre/{genre_id}", params={"page": page})
-    list_items(data, mode, display_type, genre_id)
-elif mode == "media" and args.get("media_type") and args.get("media_id"):
-    media_type = args.get("media_type")
-    media_id = args.get("media_id")
-    mediaData = api_client.client.api_request(f"/{media_type}/{media_id}", params={})
-    launch_media_dialog(mediaData)
-    sys.exit()
+    if api_client.metrics:
+        api_client.metrics.record_route(mode, (time.monotonic() - started) * 1000)
+
+def dispatch(mode):
+    try:
+        if not mode:
+            list_main_menu()
+        elif mode in routes.LIST_ROUTES:
+            show_list(mode, routes.LIST_ROUTES[mode])
+        elif mode in ACTIONS:
+            handler, arg_names = ACTIONS[mode]
+            if all(args.get(name) for name in arg_names):
+                handler(*(args[name] for name in arg_names))
+        else:
+            xbmc.log(f"[kodiseerr] Unknown mode: {mode}", xbmc.LOGWARNING)
+    finally:
+        # One write per invocation for everything recorded along the way
+        api_client.flush()
+
+dispatch(args.get('mode'))
@@ -5,7 +5,8 @@ mkdir plugin.video.kodiseerr
 for item in ./*;do
     if [[ "$item" != "./plugin.video.kodiseerr" ]] \
     && [[ "$item" != "./README.md" ]] \
-    && [[ "$item" != "./package.sh" ]];then
+    && [[ "$item" != "./package.sh" ]] \
+    && [[ "$item" != "./benchmarks" ]];then
         cp -r "$item" plugin.video.kodiseerr/
     fi
 done
@@ -0,0 +1,273 @@
+import hashlib
+import json
+import os
+import xbmc
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from resources.lib import prefetch
+
+TMDB_BASE = "https://image.tmdb.org/t/p/"
+# Jellyseerr/Overseerr serve TMDB images from their own cache here when image caching is enabled
+PROXY_PATH = "/imageproxy/tmdb/t/p/"
+
+# Art kind -> TMDB size bucket per screen class (up to 720p, up to 1080p, above)
+SIZES = {
+    'poster': ('w185', 'w342', 'w500'),
+    'fanart': ('w780', 'w1280', 'original'),
+    'logo': ('w300', 'w500', 'original'),
+}
+# What the addon always used before sizes followed the screen, kept as the "Largest" setting
+LARGEST_SIZES = {'poster': 'w500', 'fanart': 'original', 'logo': 'w500'}
+
+# Next-screen artwork left over when a tick's byte budget ran out stays queued, at most this many
+MAX_WANTED = 200
+WANTED_FILE = "wanted.json"
+DOWNLOAD_TIMEOUT = 10
+# Parallel downloads while pre-warming; Kodi's own texture loader competes for the same link
+PREWARM_WORKERS = 4
+# Art the service warms ahead of time for list items, the rest loads when shown
+PREWARM_FIELDS = (("posterPath", "poster"), ("backdropPath", "fanart"))
+# Artwork bytes downloaded per service tick, so pre-warming never hogs a slow link
+PREWARM_BYTE_BUDGET = 8 * 1024 * 1024
+
+
+def screen_class(height):
+    if height <= 720:
+        return 0
+    return 1 if height <= 1080 else 2
+
+
+def screen_height():
+    try:
+        return int(xbmc.getInfoLabel('System.ScreenHeight'))
+    except ValueError:
+        return 1080
+
+
+class ArtworkCache:
+    """Size-bounded directory of downloaded artwork.
+
+    The plugin only looks files up; art it doesn't find goes to Kodi as a
+    remote image, which Kodi keeps in its own texture cache. The service
+    downloads art for screens not shown yet and trims the directory back
+    to max_bytes. A file's mtime is the last time it was shown (or
+    downloaded), so trimming evicts the least recently shown art.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.names = None  # File names in the directory, listed on first lookup
+
+    def file_name(self, url):
+        extension = os.path.splitext(url)[1][:5] or ".jpg"
+        return hashlib.sha1(url.encode('utf-8')).hexdigest()[:20] + extension
+
+    def resolve(self, url):
+        """Returns the cached file for url, or url itself."""
+        if self.names is None:
+            try:
+                self.names = set(os.listdir(self.directory))
+            except OSError:
+                self.names = set()
+        name = self.file_name(url)
+        if name in self.names:
+            path = os.path.join(self.directory, name)
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            return path
+        return url
+
+    def has(self, url):
+        return os.path.exists(os.path.join(self.directory, self.file_name(url)))
+
+    def _read_wanted(self):
+        try:
+            with open(os.path.join(self.directory, WANTED_FILE), 'r') as f:
+                wanted = json.load(f)
+            return wanted if isinstance(wanted, list) else []
+        except (OSError, ValueError):
+            return []
+
+    def _write_wanted(self, wanted):
+        path = os.path.join(self.directory, WANTED_FILE)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path + ".tmp", 'w') as f:
+                json.dump(wanted, f)
+            os.replace(path + ".tmp", path)
+        except OSError as e:
+            xbmc.log(f"[kodiseerr] Could not queue artwork: {e}", xbmc.LOGWARNING)
+
+    def queue(self, urls):
+        """Puts urls at the front of the download queue."""
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return
+        queued = set(urls)
+        wanted = urls + [url for url in self._read_wanted() if url not in queued]
+        self._write_wanted(wanted[:MAX_WANTED])
+
+    def take_wanted(self, limit):
+        """Removes and returns up to limit queued URLs."""
+        wanted = self._read_wanted()
+        if wanted:
+            self._write_wanted(wanted[limit:])
+        return wanted[:limit]
+
+    def download(self, url):
+        """Downloads url into the cache. Returns the bytes written, 0 if it was cached already."""
+        import urllib.request
+        path = os.path.join(self.directory, self.file_name(url))
+        if os.path.exists(path):
+            return 0
+        os.makedirs(self.directory, exist_ok=True)
+        with urllib.request.urlopen(url, timeout=DOWNLOAD_TIMEOUT) as resp:
+            data = resp.read()
+        with open(path + ".tmp", 'wb') as f:
+            f.write(data)
+        os.replace(path + ".tmp", path)
+        return len(data)
+
+    def trim(self):
+        """Deletes the oldest files until the directory fits max_bytes. Returns how many were deleted."""
+        files = []
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.name != WANTED_FILE:
+                        stat = entry.stat()
+                        files.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            return 0
+        total = sum(size for _, size, _ in files)
+        deleted = 0
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            deleted += 1
+        return deleted
+
+
+def prewarm(cache, urls, byte_budget, workers=PREWARM_WORKERS):
+    """Downloads urls into cache with a few workers until byte_budget is spent.
+
+    Returns (bytes downloaded, urls left over once the budget ran out).
+    Failed downloads are logged and dropped.
+    """
+    urls = [url for url in dict.fromkeys(urls) if not cache.has(url)]
+    downloaded = 0
+    remaining = iter(urls)
+    started = 0
+
+    def download(url):
+        try:
+            return cache.download(url)
+        except Exception as e:
+            xbmc.log(f"[kodiseerr] Artwork download failed for {url}: {e}", xbmc.LOGDEBUG)
+            return 0
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        running = set()
+        while True:
+            # Sizes are only known once a download finishes, so the budget is checked between downloads
+            while len(running) < workers and downloaded < byte_budget:
+                url = next(remaining, None)
+                if url is None:
+                    break
+                running.add(pool.submit(download, url))
+                started += 1
+            if not running:
+                break
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            downloaded += sum(future.result() for future in done)
+    return downloaded, urls[started:]
+
+
+class Prewarmer:
+    """Downloads artwork before it is needed, for the service.
+
+    Only the next screen of the list the plugin rendered last is warmed:
+    art already shown went through Kodi's texture cache, and downloading it
+    again would double the traffic. Whatever doesn't fit the tick's byte
+    budget stays queued for the next tick.
+    """
+
+    def __init__(self, policy, response_cache=None, byte_budget=PREWARM_BYTE_BUDGET):
+        self.policy = policy
+        self.cache = policy.cache
+        self.response_cache = response_cache
+        self.byte_budget = byte_budget
+        self.last_hint = None
+
+    def next_screen_urls(self):
+        if not self.response_cache:
+            return []
+        hint = self.response_cache.get_meta(prefetch.LAST_LIST_KEY)
+        if not hint or hint == self.last_hint:
+            return []
+        items = []
+        for endpoint, params, _ in prefetch.next_screen(hint):
+            data = self.response_cache.peek("GET", endpoint, params)
+            if not isinstance(data, dict):
+                # Not prefetched yet, look again next tick
+                return []
+            items += data.get('results') or []
+        self.last_hint = hint
+        return self.policy.prewarm_urls(items)
+
+    def run(self):
+        """Downloads one tick's worth of artwork and trims the cache. Returns the bytes downloaded."""
+        urls = self.next_screen_urls() + self.cache.take_wanted(MAX_WANTED)
+        if not urls:
+            return 0
+        downloaded, left = prewarm(self.cache, urls, self.byte_budget)
+        self.cache.queue(left)
+        if downloaded:
+            deleted = self.cache.trim()
+            xbmc.log(f"[kodiseerr] Pre-warmed {downloaded // 1024} KB of artwork, evicted {deleted} files", xbmc.LOGDEBUG)
+        return downloaded
+
+
+class ArtworkPolicy:
+    """Builds artwork URLs in TMDB sizes that suit the screen, preferring the local artwork cache."""
+
+    def __init__(self, base=TMDB_BASE, screen=1, largest=False, cache=None):
+        self.base = base
+        self.sizes = LARGEST_SIZES if largest else {kind: sizes[screen] for kind, sizes in SIZES.items()}
+        self.cache = cache
+
+    @classmethod
+    def from_settings(cls, addon, data_path):
+        base = TMDB_BASE
+        if addon.getSettingBool('use_image_proxy'):
+            base = addon.getSetting('jellyseerr_url').rstrip('/') + PROXY_PATH
+        cache = None
+        try:
+            cache_mb = int(addon.getSetting('artwork_cache_mb') or 0)
+        except ValueError:
+            cache_mb = 0
+        if cache_mb > 0:
+            cache = ArtworkCache(os.path.join(data_path, "artwork"), cache_mb * 1024 * 1024)
+        return cls(base, screen_class(screen_height()), addon.getSetting('artwork_size') == "1", cache)
+
+    def remote_url(self, path, kind):
+        return f"{self.base}{self.sizes[kind]}{path}"
+
+    def url(self, path, kind):
+        url = self.remote_url(path, kind)
+        return self.cache.resolve(url) if self.cache else url
+
+    def prewarm_urls(self, items):
+        """Remote URLs of the art worth downloading ahead of time for list items."""
+        return [
+            self.remote_url(item[field], kind)
+            for item in items if isinstance(item, dict)
+            for field, kind in PREWARM_FIELDS if item.get(field)
+        ]
@@ -0,0 +1,99 @@
+import json
+import os
+import threading
+import time
+import xbmc
+
+# Consecutive failed requests before requests are short-circuited
+FAILURE_THRESHOLD = 3
+# Seconds to wait before letting a trial request through again
+COOL_DOWN = 30
+
+
+class CircuitBreaker:
+    """Stops sending requests to a server that keeps failing.
+
+    After FAILURE_THRESHOLD consecutive failures the circuit opens and allow()
+    refuses requests for COOL_DOWN seconds. After that a single trial request
+    is let through; its success closes the circuit, its failure opens it again.
+    State is saved to state_file so every plugin invocation and the service
+    share it; it is only written when it changes.
+    """
+
+    def __init__(self, state_file=None, threshold=FAILURE_THRESHOLD, cool_down=COOL_DOWN):
+        self.state_file = state_file
+        self.threshold = threshold
+        self.cool_down = cool_down
+        self.lock = threading.Lock()
+        self.failures = 0
+        self.opened_at = 0
+        self.trial_thread = None  # Thread running the trial request while the circuit is open
+        self._load()
+
+    def _load(self):
+        if not self.state_file:
+            return
+        try:
+            with open(self.state_file, 'r') as f:
+                state = json.load(f)
+            self.failures = int(state.get('failures', 0))
+            self.opened_at = float(state.get('opened_at', 0))
+        except (OSError, ValueError, TypeError, AttributeError):
+            pass
+
+    def _save(self):
+        if not self.state_file:
+            return
+        tmp_file = self.state_file + ".tmp"
+        try:
+            with open(tmp_file, 'w') as f:
+                json.dump({'failures': self.failures, 'opened_at': self.opened_at}, f)
+            os.replace(tmp_file, self.state_file)
+        except OSError as e:
+            xbmc.log(f"[kodiseerr] Could not save circuit state: {e}", xbmc.LOGWARNING)
+
+    @property
+    def is_open(self):
+        return self.failures >= self.threshold
+
+    def retry_in(self):
+        """Seconds until the next trial request is allowed, 0 if requests may go through now."""
+        if not self.is_open:
+            return 0
+        return max(0, self.opened_at + self.cool_down - time.time())
+
+    def allow(self):
+        with self.lock:
+            if not self.is_open:
+                return True
+            if self.trial_thread is not None or self.retry_in() > 0:
+                return False
+            self.trial_thread = threading.get_ident()
+            return True
+
+    def end_trial(self):
+        """Lets another trial through if this thread's trial ended without a result, e.g. on an unexpected error."""
+        with self.lock:
+            if self.trial_thread == threading.get_ident():
+                self.trial_thread = None
+
+    def record_success(self):
+        with self.lock:
+            self.trial_thread = None
+            if self.failures:
+                if self.is_open:
+                    xbmc.log("[kodiseerr] Server reachable again, closing circuit", xbmc.LOGINFO)
+                self.failures = 0
+                self.opened_at = 0
+                self._save()
+
+    def record_failure(self):
+        with self.lock:
+            self.trial_thread = None
+            self.failures += 1
+            if self.is_open:
+                if self.failures == self.threshold:
+                    xbmc.log(f"[kodiseerr] {self.failures} requests failed in a row, pausing requests for {self.cool_down}s",
+                             xbmc.LOGWARNING)
+                self.opened_at = time.time()
+            self._save()
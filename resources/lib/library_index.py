@@ -0,0 +1,282 @@
+import functools
+import json
+import os
+import re
+import unicodedata
+import xbmc
+import xbmcaddon
+import xbmcvfs
+
+INDEX_FILE = "library_index.json"
+# Just what list rendering needs, so the plugin never has to parse the whole index
+OWNED_FILE = "library_owned.json"
+
+MOVIE_PROPERTIES = ["title", "year", "file", "uniqueid", "playcount"]
+TVSHOW_PROPERTIES = ["title", "year", "uniqueid"]
+ID_TYPES = ('tmdb', 'imdb', 'tvdb')
+
+
+def index_path(file_name=INDEX_FILE):
+    addon = xbmcaddon.Addon()
+    data_path = xbmcvfs.translatePath(f"special://profile/addon_data/{addon.getAddonInfo('id')}/")
+    return os.path.join(data_path, file_name)
+
+
+def _write_json(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+@functools.lru_cache(maxsize=65536)
+def normalize_title(title):
+    """Lowercases and strips accents and punctuation so "Amélie" matches "Amelie" and "Spider-Man" "Spiderman"."""
+    title = unicodedata.normalize('NFKD', title or "")
+    title = "".join(c for c in title if not unicodedata.combining(c)).lower()
+    return re.sub(r'[\W_]+', '', title)
+
+
+def json_rpc(method, params):
+    response = xbmc.executeJSONRPC(json.dumps({"jsonrpc": "2.0", "id": 1, "method": method, "params": params}))
+    try:
+        return json.loads(response).get('result') or {}
+    except ValueError:
+        return {}
+
+
+def _movie_entry(movie):
+    ids = movie.get('uniqueid') or {}
+    return {
+        'title': movie.get('title', ''),
+        'year': movie.get('year') or 0,
+        'file': movie.get('file', ''),
+        'playcount': movie.get('playcount') or 0,
+        'tmdb': str(ids.get('tmdb') or ''),
+        'imdb': str(ids.get('imdb') or ''),
+    }
+
+
+def _tvshow_entry(show):
+    ids = show.get('uniqueid') or {}
+    return {
+        'title': show.get('title', ''),
+        'year': show.get('year') or 0,
+        'tmdb': str(ids.get('tmdb') or ''),
+        'imdb': str(ids.get('imdb') or ''),
+        'tvdb': str(ids.get('tvdb') or ''),
+    }
+
+
+class LibraryIndex:
+    """Maps TMDB/IMDb/TVDB ids and normalized titles to local library movies and TV shows.
+
+    The service builds it at startup and keeps it current from library
+    notifications. Each save also writes the OwnedTitles file that list
+    rendering in the plugin reads instead.
+    """
+
+    def __init__(self, movies=None, tvshows=None, movie_keys=None, tvshow_keys=None):
+        self.movies = movies or {}  # movieid (str) -> entry
+        self.tvshows = tvshows or {}  # tvshowid (str) -> entry
+        self.dirty = False
+        self.scanning = False
+        self.shared_keys = None  # Keys more than one entry has, built when the service first needs them
+        if movie_keys is None or tvshow_keys is None:
+            self._reindex()
+        else:
+            # Lookup keys are saved alongside so the plugin doesn't re-normalize every title on load
+            self.movie_keys = movie_keys
+            self.tvshow_keys = tvshow_keys
+
+    def _reindex(self):
+        self.shared_keys = set()
+        self.movie_keys = self._keys(self.movies, self.shared_keys)
+        self.tvshow_keys = self._keys(self.tvshows, self.shared_keys)
+
+    @staticmethod
+    def _entry_keys(entry):
+        """(key, fallback) pairs of one entry. A fallback key (the bare title) stays with the first entry that has it."""
+        keys = [(f"{id_type}:{entry[id_type]}", False) for id_type in ID_TYPES if entry.get(id_type)]
+        title = normalize_title(entry.get('title'))
+        if title:
+            keys += [(f"title:{title}:{entry.get('year') or 0}", False), (f"title:{title}", True)]
+        return keys
+
+    @classmethod
+    def _add_keys(cls, keys, library_id, entry, shared_keys):
+        for key, fallback in cls._entry_keys(entry):
+            if keys.get(key, library_id) != library_id:
+                shared_keys.add(key)
+            if fallback:
+                keys.setdefault(key, library_id)
+            else:
+                keys[key] = library_id
+
+    def _drop_keys(self, keys, entries, library_id, entry):
+        """Removes entry's keys, handing any that another entry has too over to it."""
+        for key, _ in self._entry_keys(entry):
+            if keys.get(key) != library_id:
+                continue
+            del keys[key]
+            if key not in self.shared_keys:
+                continue
+            # Only duplicates (two versions of a movie, remakes sharing a title) need a scan
+            for other_id, other in entries.items():
+                if other_id != library_id and any(key == other_key for other_key, _ in self._entry_keys(other)):
+                    keys[key] = other_id
+                    break
+
+    @classmethod
+    def _keys(cls, entries, shared_keys):
+        keys = {}
+        for library_id, entry in entries.items():
+            cls._add_keys(keys, library_id, entry, shared_keys)
+        return keys
+
+    def _replace(self, entries, keys, library_id, entry):
+        """Puts entry (None to remove) under library_id, updating only the lookup keys that change."""
+        old = entries.get(library_id)
+        if old == entry:
+            return
+        old_keys = self._entry_keys(old) if old else []
+        new_keys = self._entry_keys(entry) if entry else []
+        if old_keys != new_keys and self.shared_keys is None:
+            # Loaded from the file rather than built: find the shared keys once
+            self._reindex()
+        if old and old_keys != new_keys:
+            self._drop_keys(keys, entries, library_id, old)
+        if entry:
+            entries[library_id] = entry
+            if old_keys != new_keys:
+                self._add_keys(keys, library_id, entry, self.shared_keys)
+        else:
+            del entries[library_id]
+        self.dirty = True
+
+    @classmethod
+    def load(cls, path=None):
+        try:
+            with open(path or index_path(), 'r') as f:
+                data = json.load(f)
+            return cls(data.get('movies'), data.get('tvshows'), data.get('movie_keys'), data.get('tvshow_keys'))
+        except (OSError, ValueError, AttributeError):
+            return cls()
+
+    def save(self, path=None, owned_path=None):
+        try:
+            _write_json(path or index_path(), {
+                'movies': self.movies,
+                'tvshows': self.tvshows,
+                'movie_keys': self.movie_keys,
+                'tvshow_keys': self.tvshow_keys,
+            })
+            _write_json(owned_path or index_path(OWNED_FILE), self.owned_titles())
+            self.dirty = False
+        except OSError as e:
+            xbmc.log(f"[KodiSeerr Service] Could not save library index: {e}", xbmc.LOGWARNING)
+
+    def owned_titles(self):
+        """The OwnedTitles file's contents: TMDB id -> [file, playcount] for movies, TMDB id -> tvshowid for shows."""
+        movies = {}
+        for key, movieid in self.movie_keys.items():
+            if key.startswith('tmdb:'):
+                movie = self.movies[movieid]
+                movies[key[5:]] = [movie['file'], movie['playcount']]
+        tvshows = {key[5:]: int(tvshowid) for key, tvshowid in self.tvshow_keys.items() if key.startswith('tmdb:')}
+        return {'movies': movies, 'tvshows': tvshows}
+
+    def rebuild(self):
+        movies = json_rpc("VideoLibrary.GetMovies", {"properties": MOVIE_PROPERTIES}).get('movies', [])
+        tvshows = json_rpc("VideoLibrary.GetTVShows", {"properties": TVSHOW_PROPERTIES}).get('tvshows', [])
+        self.movies = {str(m['movieid']): _movie_entry(m) for m in movies}
+        self.tvshows = {str(s['tvshowid']): _tvshow_entry(s) for s in tvshows}
+        self._reindex()
+        self.dirty = True
+
+    def update_item(self, item_type, library_id):
+        """Refreshes one movie or TV show after a VideoLibrary.OnUpdate notification."""
+        if item_type == 'movie':
+            movie = json_rpc("VideoLibrary.GetMovieDetails", {"movieid": library_id, "properties": MOVIE_PROPERTIES}).get('moviedetails')
+            if movie:
+                self._replace(self.movies, self.movie_keys, str(library_id), _movie_entry(movie))
+        elif item_type == 'tvshow':
+            show = json_rpc("VideoLibrary.GetTVShowDetails", {"tvshowid": library_id, "properties": TVSHOW_PROPERTIES}).get('tvshowdetails')
+            if show:
+                self._replace(self.tvshows, self.tvshow_keys, str(library_id), _tvshow_entry(show))
+
+    def remove_item(self, item_type, library_id):
+        if item_type == 'movie' and str(library_id) in self.movies:
+            self._replace(self.movies, self.movie_keys, str(library_id), None)
+        elif item_type == 'tvshow' and str(library_id) in self.tvshows:
+            self._replace(self.tvshows, self.tvshow_keys, str(library_id), None)
+
+    def handle_notification(self, method, data):
+        """Applies a VideoLibrary.* notification. Full scans are folded into one rebuild at the end."""
+        if method == 'VideoLibrary.OnScanStarted':
+            self.scanning = True
+            return
+        if method in ('VideoLibrary.OnScanFinished', 'VideoLibrary.OnCleanFinished'):
+            self.scanning = False
+            self.rebuild()
+            return
+        if self.scanning or method not in ('VideoLibrary.OnUpdate', 'VideoLibrary.OnRemove'):
+            return
+        try:
+            payload = json.loads(data) if data else {}
+        except ValueError:
+            return
+        # OnUpdate wraps the item, OnRemove doesn't
+        item = payload.get('item') or payload
+        if item.get('id') is None:
+            return
+        if method == 'VideoLibrary.OnUpdate':
+            self.update_item(item.get('type'), item['id'])
+        else:
+            self.remove_item(item.get('type'), item['id'])
+
+    @staticmethod
+    def _lookup(keys, tmdb_id=None, imdb_id=None, tvdb_id=None, title=None, year=None):
+        candidates = [f"{id_type}:{value}" for id_type, value in (('tmdb', tmdb_id), ('imdb', imdb_id), ('tvdb', tvdb_id)) if value]
+        normalized = normalize_title(title)
+        if normalized:
+            candidates += [f"title:{normalized}:{year or 0}", f"title:{normalized}"]
+        for key in candidates:
+            if key in keys:
+                return keys[key]
+        return None
+
+    def find_movie(self, **ids):
+        """Returns the movie's index entry (with 'file') or None."""
+        movieid = self._lookup(self.movie_keys, **ids)
+        return self.movies.get(movieid) if movieid else None
+
+    def find_tvshow_id(self, **ids):
+        """Returns the library tvshowid or None."""
+        tvshowid = self._lookup(self.tvshow_keys, **ids)
+        return int(tvshowid) if tvshowid else None
+
+
+class OwnedTitles:
+    """Which TMDB ids the library has, as written by LibraryIndex.save(). What the plugin uses to mark list items."""
+
+    def __init__(self, movies=None, tvshows=None):
+        self.movies = movies or {}  # TMDB id -> [file, playcount]
+        self.tvshows = tvshows or {}  # TMDB id -> tvshowid
+
+    @classmethod
+    def load(cls, path=None):
+        try:
+            with open(path or index_path(OWNED_FILE), 'r') as f:
+                data = json.load(f)
+            return cls(data.get('movies'), data.get('tvshows'))
+        except (OSError, ValueError, AttributeError):
+            return cls()
+
+    def find_movie(self, tmdb_id):
+        """Returns {'file', 'playcount'} for the movie or None."""
+        movie = self.movies.get(tmdb_id)
+        return {'file': movie[0], 'playcount': movie[1]} if movie else None
+
+    def find_tvshow_id(self, tmdb_id):
+        return self.tvshows.get(tmdb_id)
@@ -4,16 +4,61 @@ import xbmcplugin
 import sys
 import urllib.parse
 import json
+import threading
+from resources.lib.library_index import LibraryIndex
 
 class MediaDialog(xbmcgui.WindowXMLDialog):
+    """Media details with Watch/Request buttons.
+
+    With a loader, media only holds what the list already knew (title,
+    poster, overview, date, rating): the dialog opens with that right away
+    and loader() fetches the full details, poster and fanart URLs included,
+    on a background thread. The buttons stay hidden until the details tell
+    the media's status.
+    """
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.media = kwargs.get('media', {})
-        self.media_info = self.media.get('mediaInfo', {})
+        self.loader = kwargs.get('loader')
+        self.loading = None
+        self.loaded = not self.loader
+        self._set_media(kwargs.get('media', {}))
+
+    def _set_media(self, media):
+        self.media = media
+        self.media_info = self.media.get('mediaInfo') or {}
         self.status_code = self.media_info.get('status', 0)
         self.status_text = self.media.get('status', 'Unknown')
 
     def onInit(self):
+        self._show_media()
+        if self.loader and self.loading is None:
+            for control_id in (106, 107, 109):
+                self._set_visible(control_id, False)
+            self._set_label(108, '[COLOR grey]Loading details...[/COLOR]')
+            self.loading = threading.Thread(target=self._load_details, name="kodiseerr-details", daemon=True)
+            self.loading.start()
+        elif not self.loader:
+            self._apply_status_logic()
+
+    def _load_details(self):
+        try:
+            details = self.loader()
+        except Exception:
+            import traceback
+            traceback.print_exc()
+            details = None
+        if not details:
+            self._set_label(108, "[COLOR red]Couldn't load details[/COLOR]")
+            return
+        # The preview may have had no art (old favourites, lists without images); keep its URLs otherwise
+        self._set_media(dict(details, poster=details.get('poster') or self.media.get('poster'),
+                             fanart=details.get('fanart') or self.media.get('fanart')))
+        self.loaded = True
+        self._show_media()
+        self._apply_status_logic()
+
+    def _show_media(self):
         poster = self.media.get('poster') or self.media.get('poster_path')
         if poster:
             try:
@@ -33,6 +78,12 @@ class MediaDialog(xbmcgui.WindowXMLDialog):
         rating = self.media.get('voteAverage')
         self._set_label(111, f"Rating: {rating}/10" if rating else "Rating: N/A")
 
+        if not self.loaded:
+            # The list didn't know the rest, leave it blank rather than "N/A" until the details arrive
+            for control_id in range(112, 119):
+                self._set_label(control_id, '')
+            return
+
         genres = ", ".join(g['name'] for g in self.media.get('genres', []))
         self._set_label(112, f"Genres: {genres or 'N/A'}")
 
@@ -65,8 +116,6 @@ class MediaDialog(xbmcgui.WindowXMLDialog):
             self._set_label(117, '')
         self._set_label(118, f"Show Status: {self.status_text}")
 
-        self._apply_status_logic()
-
     def _set_label(self, control_id, text):
         try:
             self.getControl(control_id).setLabel(text)
@@ -111,12 +160,13 @@ class MediaDialog(xbmcgui.WindowXMLDialog):
             media_type = self.media_info.get('mediaType')
             title = self.media.get('title') or self.media.get('name')
 
-            if media_type == 'movie':
-                file_path = self._find_movie_path_by_title(title)
-            elif media_type == 'tv':
-                file_path = self._find_first_unwatched_episode(title)
-            else:
-                file_path = None
+            indexed, file_path = self._find_in_library_index(media_type, title)
+            if not indexed:
+                # Index not built yet (service not running): fall back to title queries
+                if media_type == 'movie':
+                    file_path = self._find_movie_path_by_title(title)
+                elif media_type == 'tv':
+                    file_path = self._find_first_unwatched_episode(title)
 
             if file_path:
                 xbmcgui.Dialog().notification("KodiSeerr", "Playing from library...", xbmcgui.NOTIFICATION_INFO)
@@ -138,6 +188,51 @@ class MediaDialog(xbmcgui.WindowXMLDialog):
             xbmc.executebuiltin(f'RunPlugin({url})')
             self.close()
 
+    def _find_in_library_index(self, media_type, title):
+        """Resolves the file to play through the service's library index.
+
+        Returns (index available, file path or None).
+        """
+        index = LibraryIndex.load()
+        if not index.movies and not index.tvshows:
+            return False, None
+        external_ids = self.media.get('externalIds') or {}
+        release_date = self.media.get('releaseDate') or self.media.get('firstAirDate') or ''
+        year = release_date.split('-')[0]
+        ids = {
+            'tmdb_id': self.media.get('id') or self.media_info.get('tmdbId'),
+            'imdb_id': self.media.get('imdbId') or external_ids.get('imdbId'),
+            'tvdb_id': external_ids.get('tvdbId') or self.media_info.get('tvdbId'),
+            'title': title,
+            'year': int(year) if year.isdigit() else 0,
+        }
+        if media_type == 'movie':
+            movie = index.find_movie(**ids)
+            return True, movie['file'] if movie else None
+        if media_type == 'tv':
+            tvshowid = index.find_tvshow_id(**ids)
+            return True, self._first_unwatched_episode(tvshowid) if tvshowid is not None else None
+        return True, None
+
+    def _first_unwatched_episode(self, tvshowid):
+        """Picks the first unwatched episode of a library show, or its first episode, with one JSON-RPC call."""
+        query = {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "VideoLibrary.GetEpisodes",
+            "params": {
+                "tvshowid": tvshowid,
+                "properties": ["playcount", "file"],
+                "sort": {"order": "ascending", "method": "episode"}
+            }
+        }
+        response = xbmc.executeJSONRPC(json.dumps(query))
+        episodes = json.loads(response).get('result', {}).get('episodes', [])
+        for episode in episodes:
+            if not episode.get('playcount'):
+                return episode['file']
+        return episodes[0]['file'] if episodes else None
+
     def _find_movie_path_by_title(self, title):
         query = {
             "jsonrpc": "2.0",
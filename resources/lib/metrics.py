@@ -0,0 +1,194 @@
+import math
+import re
+import sqlite3
+import threading
+import time
+import xbmc
+
+# Samples are bucketed per hour and kept for a week, so the statistics roll
+# forward instead of growing forever
+WINDOW = 60 * 60
+KEEP_WINDOWS = 7 * 24
+# Quarter-octave buckets: each bucket's upper bound is ~19% above the previous one
+BUCKETS_PER_OCTAVE = 4
+
+# Phases of a network request, in the order they happen (milliseconds)
+PHASES = ('dns', 'connect', 'tls', 'ttfb', 'total')
+
+_ID_SEGMENT = re.compile(r'/\d+(?=/|$)')
+
+
+def endpoint_name(method, endpoint):
+    """Groups requests per endpoint shape, e.g. "GET /movie/{id}"."""
+    return f"{method} {_ID_SEGMENT.sub('/{id}', endpoint)}"
+
+
+def bucket_for(value):
+    return 0 if value <= 1 else math.ceil(math.log2(value) * BUCKETS_PER_OCTAVE)
+
+
+def bucket_value(bucket):
+    """Upper bound of a bucket, used as the value of every sample in it."""
+    return 2 ** (bucket / BUCKETS_PER_OCTAVE)
+
+
+def percentile(buckets, fraction):
+    """Estimates a percentile from {bucket: count}."""
+    total = sum(buckets.values())
+    if not total:
+        return 0
+    seen = 0
+    for bucket in sorted(buckets):
+        seen += buckets[bucket]
+        if seen >= fraction * total:
+            return bucket_value(bucket)
+    return bucket_value(max(buckets))
+
+
+class Metrics:
+    """Rolling timing histograms for API requests and plugin routes.
+
+    Samples are collected in memory and written to SQLite in one transaction
+    by flush(), so recording costs a dict update per sample. With log_each
+    every request is also written to the Kodi log at LOGINFO.
+    """
+
+    def __init__(self, path, log_each=False):
+        self.path = path
+        self.log_each = log_each
+        self.lock = threading.Lock()
+        self.samples = {}  # (name, metric, bucket) -> count
+        self.events = {}  # (name, event) -> count
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=5)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS samples ("
+            " name TEXT NOT NULL, metric TEXT NOT NULL, window INTEGER NOT NULL,"
+            " bucket INTEGER NOT NULL, count INTEGER NOT NULL,"
+            " PRIMARY KEY (name, metric, window, bucket))"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS events ("
+            " name TEXT NOT NULL, event TEXT NOT NULL, window INTEGER NOT NULL, count INTEGER NOT NULL,"
+            " PRIMARY KEY (name, event, window))"
+        )
+        return conn
+
+    def observe(self, name, metric, value):
+        key = (name, metric, bucket_for(value))
+        with self.lock:
+            self.samples[key] = self.samples.get(key, 0) + 1
+
+    def event(self, name, event):
+        key = (name, event)
+        with self.lock:
+            self.events[key] = self.events.get(key, 0) + 1
+
+    def record_request(self, method, endpoint, status, size, timings):
+        """Records one network request. status is None when it failed before a response.
+
+        size is the decoded body; timings may carry the size on the wire as
+        'wire_bytes', which differs for compressed responses.
+        """
+        name = endpoint_name(method, endpoint)
+        for phase in PHASES:
+            if phase in timings:
+                self.observe(name, phase, timings[phase])
+        wire_bytes = timings.get('wire_bytes', size)
+        self.observe(name, 'bytes', wire_bytes)
+        if wire_bytes != size:
+            self.observe(name, 'decoded bytes', size)
+        self.event(name, 'network')
+        self.event(name, f"HTTP {status}" if status else "error")
+        if self.log_each:
+            phases = " ".join(f"{phase} {timings[phase]:.0f}ms" for phase in PHASES if phase in timings)
+            xbmc.log(f"[kodiseerr] {method} {endpoint} -> {status or 'error'}, {wire_bytes} B ({size} B decoded), {phases}",
+                     xbmc.LOGINFO)
+
+    def record_cached(self, method, endpoint, elapsed):
+        name = endpoint_name(method, endpoint)
+        self.observe(name, 'cached', elapsed)
+        self.event(name, 'cache hit')
+        if self.log_each:
+            xbmc.log(f"[kodiseerr] {method} {endpoint} -> cache hit, {elapsed:.1f}ms", xbmc.LOGINFO)
+
+    def record_route(self, mode, elapsed):
+        self.observe(f"route {mode}", 'total', elapsed)
+        if self.log_each:
+            xbmc.log(f"[kodiseerr] Route {mode} took {elapsed:.0f}ms", xbmc.LOGINFO)
+
+    def flush(self):
+        """Adds the samples collected so far to the stored histograms and drops expired windows."""
+        with self.lock:
+            samples, self.samples = self.samples, {}
+            events, self.events = self.events, {}
+        if not samples and not events:
+            return
+        window = int(time.time() // WINDOW)
+        try:
+            conn = self._connect()
+            try:
+                # INSERT OR IGNORE + UPDATE rather than an upsert, which older SQLite builds lack
+                for (name, metric, bucket), count in samples.items():
+                    conn.execute("INSERT OR IGNORE INTO samples VALUES (?, ?, ?, ?, 0)", (name, metric, window, bucket))
+                    conn.execute(
+                        "UPDATE samples SET count = count + ? WHERE name = ? AND metric = ? AND window = ? AND bucket = ?",
+                        (count, name, metric, window, bucket)
+                    )
+                for (name, event), count in events.items():
+                    conn.execute("INSERT OR IGNORE INTO events VALUES (?, ?, ?, 0)", (name, event, window))
+                    conn.execute(
+                        "UPDATE events SET count = count + ? WHERE name = ? AND event = ? AND window = ?",
+                        (count, name, event, window)
+                    )
+                conn.execute("DELETE FROM samples WHERE window <= ?", (window - KEEP_WINDOWS,))
+                conn.execute("DELETE FROM events WHERE window <= ?", (window - KEEP_WINDOWS,))
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            xbmc.log(f"[kodiseerr] Could not save timings: {e}", xbmc.LOGWARNING)
+
+    def summary(self):
+        """Returns {name: {'metrics': {metric: (count, p50, p95)}, 'events': {event: count}}} over the kept windows."""
+        try:
+            conn = self._connect()
+            try:
+                sample_rows = conn.execute(
+                    "SELECT name, metric, bucket, SUM(count) FROM samples GROUP BY name, metric, bucket"
+                ).fetchall()
+                event_rows = conn.execute("SELECT name, event, SUM(count) FROM events GROUP BY name, event").fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            xbmc.log(f"[kodiseerr] Could not read timings: {e}", xbmc.LOGWARNING)
+            return {}
+
+        histograms = {}
+        for name, metric, bucket, count in sample_rows:
+            histograms.setdefault(name, {}).setdefault(metric, {})[bucket] = count
+        summary = {}
+        for name, metrics in histograms.items():
+            summary[name] = {'metrics': {
+                metric: (sum(buckets.values()), percentile(buckets, 0.5), percentile(buckets, 0.95))
+                for metric, buckets in metrics.items()
+            }, 'events': {}}
+        for name, event, count in event_rows:
+            summary.setdefault(name, {'metrics': {}, 'events': {}})['events'][event] = count
+        return summary
+
+    def clear(self):
+        with self.lock:
+            self.samples.clear()
+            self.events.clear()
+        try:
+            conn = self._connect()
+            try:
+                conn.execute("DELETE FROM samples")
+                conn.execute("DELETE FROM events")
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            xbmc.log(f"[kodiseerr] Could not clear timings: {e}", xbmc.LOGWARNING)
@@ -0,0 +1,89 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import xbmc
+
+DEFAULT_MAX_AGE_DAYS = 180
+# Expiring is a write, so only do it this often
+EXPIRE_EVERY = 24 * 60 * 60
+
+
+class NotificationLedger:
+    """Remembers which media were already announced so each one is notified only once.
+
+    Backed by SQLite so updates are transactional and only happen when
+    something actually changed, which keeps SD-card writes to a minimum.
+    """
+
+    def __init__(self, path, max_age_days=DEFAULT_MAX_AGE_DAYS):
+        self.max_age = max_age_days * 24 * 60 * 60
+        self.last_expired = 0
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS notified ("
+            " media_type TEXT NOT NULL,"
+            " media_id TEXT NOT NULL,"
+            " notified_at REAL NOT NULL,"
+            " PRIMARY KEY (media_type, media_id))"
+        )
+        self.conn.commit()
+
+    def import_legacy(self, json_file):
+        """Moves ids from the old notified_requests.json into the ledger and deletes the file."""
+        try:
+            with open(json_file, 'r') as f:
+                media_ids = json.load(f)
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        with self.lock:
+            # The old file didn't record media types; an empty type matches any
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO notified VALUES ('', ?, ?)",
+                ((str(media_id), now) for media_id in media_ids)
+            )
+            self.conn.commit()
+        try:
+            os.remove(json_file)
+        except OSError:
+            pass
+        xbmc.log(f"[KodiSeerr Service] Imported {len(media_ids)} entries into the notification ledger", xbmc.LOGINFO)
+
+    def contains(self, media_type, media_id):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT 1 FROM notified WHERE media_id = ? AND media_type IN (?, '')",
+                (str(media_id), media_type or '')
+            ).fetchone()
+        return row is not None
+
+    def add(self, media_type, media_id):
+        """Records a notification. Returns False if it was already in the ledger.
+
+        Check and insert are one statement, so the webhook receiver and the
+        poller can't both claim the same media.
+        """
+        with self.lock:
+            inserted = self.conn.execute(
+                "INSERT OR IGNORE INTO notified SELECT ?, ?, ?"
+                " WHERE NOT EXISTS (SELECT 1 FROM notified WHERE media_id = ? AND media_type IN (?, ''))",
+                (media_type or '', str(media_id), time.time(), str(media_id), media_type or '')
+            ).rowcount == 1
+            if inserted:
+                self.conn.commit()
+        return inserted
+
+    def expire(self):
+        """Forgets entries older than the configured age, at most once a day."""
+        now = time.time()
+        if now - self.last_expired < EXPIRE_EVERY:
+            return
+        self.last_expired = now
+        with self.lock:
+            deleted = self.conn.execute("DELETE FROM notified WHERE notified_at < ?", (now - self.max_age,)).rowcount
+            self.conn.commit()
+        if deleted:
+            xbmc.log(f"[KodiSeerr Service] Expired {deleted} notification ledger entries", xbmc.LOGDEBUG)
@@ -0,0 +1,33 @@
+# NotifyAll message the plugin sends after submitting a request, so polling speeds up again
+REQUEST_SENT_MESSAGE = "request_sent"
+# Polls in a row without any change to the pending requests before polling slows down
+QUIET_POLLS = 6
+
+
+class PollScheduler:
+    """Decides how long to wait before the next request poll.
+
+    Polls at the base interval while requests are still on their way, and
+    doubles the wait up to max_interval while nothing is pending, the server
+    can't be reached, or the pending requests haven't moved for QUIET_POLLS
+    polls (a request can sit in the queue for days).
+    """
+
+    def __init__(self, base_interval, max_interval):
+        self.base_interval = base_interval
+        self.max_interval = max(base_interval, max_interval)
+        self.current = base_interval
+        self.quiet = 0
+
+    def next_delay(self, has_pending, failed, changed=True):
+        self.quiet = 0 if changed else self.quiet + 1
+        if has_pending and not failed and self.quiet < QUIET_POLLS:
+            self.current = self.base_interval
+        else:
+            self.current = min(self.max_interval, self.current * 2)
+        return self.current
+
+    def reset(self):
+        """Goes back to fast polling, e.g. right after the user sent a new request."""
+        self.current = self.base_interval
+        self.quiet = 0
@@ -0,0 +1,79 @@
+import xbmc
+from resources.lib import routes
+
+# Seconds to wait before each prefetch so it never lands on top of a foreground request
+PREFETCH_SPACING = 2
+
+# Meta key under which default.py records the list the user is looking at
+LAST_LIST_KEY = "last_list"
+# NotifyAll message the plugin sends so the service picks up a new hint right away
+WAKE_MESSAGE = "prefetch"
+
+
+def remember_list(cache, endpoint, params, page, total_pages, pages=1, ttl=None):
+    """Called by the plugin after rendering a paged list so the service can warm the next screen.
+
+    page is the last server page on screen and pages the number of server
+    pages that make up one screen. ttl is the route's cache lifetime.
+    """
+    if not cache:
+        return
+    cache.set_meta(LAST_LIST_KEY, {
+        "endpoint": endpoint,
+        "params": {k: str(v) for k, v in (params or {}).items()},
+        "page": page,
+        "total_pages": total_pages,
+        "pages": pages,
+        "ttl": ttl,
+    })
+
+
+def next_screen(hint):
+    """(endpoint, params, ttl) of the server pages that make up the screen after the one remember_list() recorded."""
+    try:
+        page, total_pages = int(hint["page"]), int(hint["total_pages"])
+        pages = int(hint.get("pages", 1))
+    except (KeyError, TypeError, ValueError):
+        return []
+    return [(hint["endpoint"], dict(hint["params"], page=p), hint.get("ttl"))
+            for p in range(page + 1, min(page + pages, total_pages) + 1)]
+
+
+class Prefetcher:
+    """Warms the response cache from the service, one spaced-out request at a time."""
+
+    def __init__(self, client, monitor, spacing=PREFETCH_SPACING):
+        self.client = client
+        self.monitor = monitor
+        self.spacing = spacing
+        self.player = xbmc.Player()
+        # Lists reachable from the main menu, warmed once right after Kodi starts
+        self.queue = routes.startup_lists()
+        self.last_hint = None
+
+    def schedule_next_page(self):
+        """Queues the server pages of the next screen of the last list the plugin rendered, ahead of anything else."""
+        hint = self.client.cache.get_meta(LAST_LIST_KEY)
+        if not hint or hint == self.last_hint:
+            return
+        self.last_hint = hint
+        self.queue[:0] = next_screen(hint)
+
+    def run(self, budget):
+        """Fetches up to budget queued lists that aren't already fresh in the cache.
+
+        Stops early while a video is playing and returns False once Kodi asks to exit.
+        """
+        fetched = 0
+        while self.queue and fetched < budget:
+            if self.player.isPlayingVideo():
+                break
+            endpoint, params, ttl = self.queue.pop(0)
+            if self.client.cache.has_fresh("GET", endpoint, params):
+                continue
+            if self.monitor.waitForAbort(self.spacing):
+                return False
+            if self.client.api_request(endpoint, params=params, refresh=True, ttl=ttl) is not None:
+                self.client.cache.count("prefetches")
+                fetched += 1
+        return True
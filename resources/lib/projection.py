@@ -0,0 +1,39 @@
+import re
+
+# Cast members kept on detail pages; the dialog shows three, list items a few more
+MAX_CAST = 20
+CAST_FIELDS = ('id', 'name', 'character', 'profilePath')
+# Crew jobs anything in the addon looks at
+CREW_JOBS = ('Director',)
+# Detail subtrees nothing in the addon reads
+UNUSED_DETAIL_FIELDS = ('relatedVideos', 'watchProviders', 'keywords', 'recommendations', 'similar')
+
+
+def trim_details(data):
+    """Drops what the addon never shows from a /movie/{id} or /tv/{id} response, mainly the full crew list."""
+    for field in UNUSED_DETAIL_FIELDS:
+        data.pop(field, None)
+    credits = data.get('credits')
+    if isinstance(credits, dict):
+        data['credits'] = {
+            'cast': [{k: c[k] for k in CAST_FIELDS if k in c} for c in (credits.get('cast') or [])[:MAX_CAST]],
+            'crew': [c for c in credits.get('crew') or () if c.get('job') in CREW_JOBS],
+        }
+    return data
+
+
+# (endpoint pattern, function returning the trimmed response). First match wins,
+# responses of other endpoints are kept as they are.
+PROJECTIONS = (
+    (re.compile(r'^/(movie|tv)/\d+$'), trim_details),
+)
+
+
+def project(endpoint, data):
+    """Trims a decoded response to the fields the addon uses, before it is cached or handed out."""
+    if not isinstance(data, dict):
+        return data
+    for pattern, trim in PROJECTIONS:
+        if pattern.match(endpoint):
+            return trim(data)
+    return data
@@ -0,0 +1,170 @@
+import json
+import os
+import xbmc
+
+PAGE_SIZE = 20
+# The in-progress list is read in bigger pages when it has to be read in full
+LISTING_PAGE_SIZE = 100
+# Media statuses that may still turn into "available": pending, processing, partially available
+PENDING_STATUSES = (2, 3, 4)
+AVAILABLE = 5
+
+
+def summarize(item):
+    media = item.get('media') or {}
+    return {
+        'request_id': item.get('id'),
+        'media_id': str(media.get('tmdbId') or media.get('id') or ""),
+        'media_type': media.get('mediaType') or item.get('type') or "",
+        'title': media.get('title') or media.get('name') or "Media",
+        'status': media.get('status', 1),
+    }
+
+
+class RequestPoller:
+    """Finds requests whose media became available without re-reading the whole request history.
+
+    Pending requests are tracked from the server's list of in-progress
+    requests. A poll reads only the first page of that list: while its total
+    and newest entries are unchanged nothing dropped out, so the rest is left
+    alone. Otherwise the list is read in full and just the requests that
+    dropped out of it are looked up. In the default mode the requests
+    modified since the previous poll's high-water mark are read as well, to
+    catch those that became available before they were ever seen in progress.
+    """
+
+    def __init__(self, client, state_file, processing_only=False, page_size=PAGE_SIZE):
+        self.client = client
+        self.state_file = state_file
+        self.processing_only = processing_only
+        self.page_size = page_size
+        self.state = self._load()
+        # Whether the last poll saw a request become available or the pending set change
+        self.changed = True
+
+    def _load(self):
+        try:
+            with open(self.state_file, 'r') as f:
+                state = json.load(f)
+            if isinstance(state, dict):
+                return {'watermark': state.get('watermark'), 'pending': state.get('pending') or {},
+                        'head': state.get('head')}
+        except (OSError, ValueError):
+            pass
+        return {'watermark': None, 'pending': {}, 'head': None}
+
+    def _save(self):
+        tmp_file = self.state_file + ".tmp"
+        try:
+            with open(tmp_file, 'w') as f:
+                json.dump(self.state, f)
+            os.replace(tmp_file, self.state_file)
+        except OSError as e:
+            xbmc.log(f"[KodiSeerr Service] Could not save poller state: {e}", xbmc.LOGWARNING)
+
+    @property
+    def has_pending(self):
+        return bool(self.state['pending'])
+
+    def _fetch_page(self, skip, request_filter, take=None):
+        return self.client.api_request('/request', params={
+            'take': take or self.page_size,
+            'skip': skip,
+            'sort': 'modified',
+            'sortDirection': 'desc',
+            'filter': request_filter,
+        })
+
+    def poll(self):
+        """Returns summaries of requests that became available since the last poll, or None if the server failed."""
+        before = json.dumps(self.state, sort_keys=True)
+        pending_before = set(self.state['pending'])
+        available = []
+        if (self.processing_only or self._poll_modified(available)) and self._poll_processing(available):
+            self.changed = bool(available) or set(self.state['pending']) != pending_before
+            if json.dumps(self.state, sort_keys=True) != before:
+                self._save()
+            return available
+        # Leave the state as it was, so nothing found before the failure goes unannounced
+        self.state = json.loads(before)
+        return None
+
+    def _poll_modified(self, available):
+        watermark = self.state['watermark']
+        newest = watermark
+        skip = 0
+        while True:
+            data = self._fetch_page(skip, 'all')
+            if not isinstance(data, dict):
+                return False
+            results = data.get('results', [])
+            reached_seen = False
+            for item in results:
+                updated = item.get('updatedAt') or ""
+                if watermark and updated <= watermark:
+                    reached_seen = True
+                    break
+                if not newest or updated > newest:
+                    newest = updated
+                summary = summarize(item)
+                if summary['status'] == AVAILABLE:
+                    self.state['pending'].pop(str(summary['request_id']), None)
+                    available.append(summary)
+
+            total = (data.get('pageInfo') or {}).get('results')
+            skip += self.page_size
+            # Without a watermark (first run) only the newest page is read to seed it
+            if reached_seen or not watermark or len(results) < self.page_size or (total is not None and skip >= total):
+                break
+
+        self.state['watermark'] = newest
+        return True
+
+    def _poll_processing(self, available):
+        data = self._fetch_page(0, 'processing')
+        if not isinstance(data, dict):
+            return False
+        head = [(data.get('pageInfo') or {}).get('results'), [item.get('id') for item in data.get('results', [])]]
+        if head == self.state['head']:
+            return True
+
+        listed = self._list_processing()
+        if listed is None:
+            return False
+        gone = {key: summary for key, summary in self.state['pending'].items() if key not in listed}
+        self.state['pending'] = listed
+        self.state['head'] = head
+        self._look_up(gone, available)
+        return True
+
+    def _list_processing(self):
+        """Every in-progress request as request id -> summary, or None if the server failed."""
+        listed = {}
+        skip = 0
+        while True:
+            data = self._fetch_page(skip, 'processing', LISTING_PAGE_SIZE)
+            if not isinstance(data, dict):
+                return None
+            results = data.get('results', [])
+            for item in results:
+                summary = summarize(item)
+                listed[str(summary['request_id'])] = summary
+            total = (data.get('pageInfo') or {}).get('results')
+            skip += LISTING_PAGE_SIZE
+            if len(results) < LISTING_PAGE_SIZE or (total is not None and skip >= total):
+                return listed
+
+    def _look_up(self, gone, available):
+        """Finds out what happened to tracked requests that dropped out of the in-progress list."""
+        items = self.client.api_request_many([f"/request/{key}" for key in gone])
+        for (key, tracked), item in zip(gone.items(), items):
+            if not isinstance(item, dict):
+                # Couldn't tell, keep it and list again next poll
+                self.state['pending'][key] = tracked
+                self.state['head'] = None
+                continue
+            summary = summarize(item)
+            if summary['status'] in PENDING_STATUSES:
+                self.state['pending'][key] = summary
+            elif summary['status'] == AVAILABLE:
+                available.append(summary)
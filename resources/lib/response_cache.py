@@ -0,0 +1,283 @@
+import json
+import sqlite3
+import threading
+import time
+import xbmc
+
+# (endpoint prefix, seconds a response stays fresh). First match wins and
+# anything not listed here (e.g. /request, /search) is never cached.
+TTL_RULES = (
+    ("/genres/", 24 * 60 * 60),
+    ("/discover/", 15 * 60),
+)
+
+MAX_ENTRIES = 500
+MAX_BYTES = 20 * 1024 * 1024
+# Expired entries older than this are never served, even in stale-while-revalidate mode
+MAX_STALE_AGE = 7 * 24 * 60 * 60
+# Only entries someone looked at within this window are worth refreshing in the background
+REFRESH_WINDOW = 24 * 60 * 60
+# An entry's access time is only rewritten once it is this far behind, so reads rarely cause a write
+ACCESS_GRANULARITY = 5 * 60
+
+# Bump whenever the table layout changes; the cache is simply rebuilt
+SCHEMA_VERSION = 3
+
+
+class ResponseCache:
+    """SQLite-backed cache of read-only API responses, shared by the plugin and service.
+
+    Reads never write: hit/miss counters and access times are kept in memory
+    and written with the next put() or flush(), which callers run on exit.
+    """
+
+    def __init__(self, path, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.pending_counts = {}  # counter name -> amount not written yet
+        self.pending_access = {}  # key -> access time not written yet
+        self.conn = None
+        try:
+            self.conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+            self._create_schema()
+        except sqlite3.Error as e:
+            xbmc.log(f"[kodiseerr] Response cache unavailable: {e}", xbmc.LOGWARNING)
+            self.conn = None
+
+    def _create_schema(self):
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self.conn.execute("DROP TABLE IF EXISTS responses")
+            self.conn.execute("DROP TABLE IF EXISTS counters")
+            self.conn.execute("DROP TABLE IF EXISTS meta")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " endpoint TEXT NOT NULL,"
+            " params TEXT NOT NULL,"
+            " payload TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " stored_at REAL NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.conn.commit()
+
+    @staticmethod
+    def ttl_for(endpoint):
+        for prefix, ttl in TTL_RULES:
+            if endpoint.startswith(prefix):
+                return ttl
+        return 0
+
+    @staticmethod
+    def make_params(params=None):
+        return json.dumps({k: str(v) for k, v in (params or {}).items()}, sort_keys=True)
+
+    @classmethod
+    def make_key(cls, method, endpoint, params=None):
+        return f"{method} {endpoint}?{cls.make_params(params)}"
+
+    def get(self, method, endpoint, params=None, allow_stale=False):
+        """Returns the cached payload, or None on a miss.
+
+        Expired entries are only returned when allow_stale is set, in which
+        case the caller is expected to rely on a background refresh.
+        """
+        if not self.conn:
+            return None
+        key = self.make_key(method, endpoint, params)
+        now = time.time()
+        try:
+            with self.lock:
+                row = self.conn.execute(
+                    "SELECT payload, expires_at, stored_at, accessed_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    outcome = "misses"
+                elif row[1] > now:
+                    outcome = "fresh_hits"
+                elif allow_stale and now - row[2] < MAX_STALE_AGE:
+                    outcome = "stale_hits"
+                else:
+                    outcome = "expired_misses"
+                self._count(outcome)
+                if outcome in ("fresh_hits", "stale_hits") and now - row[3] >= ACCESS_GRANULARITY:
+                    self.pending_access[key] = now
+            if outcome in ("fresh_hits", "stale_hits"):
+                return json.loads(row[0])
+            return None
+        except (sqlite3.Error, ValueError) as e:
+            xbmc.log(f"[kodiseerr] Response cache read failed: {e}", xbmc.LOGWARNING)
+            return None
+
+    def has_fresh(self, method, endpoint, params=None):
+        """Checks for a fresh entry without counting it as a hit or touching its access time."""
+        if not self.conn:
+            return False
+        try:
+            with self.lock:
+                row = self.conn.execute(
+                    "SELECT 1 FROM responses WHERE key = ? AND expires_at > ?",
+                    (self.make_key(method, endpoint, params), time.time())
+                ).fetchone()
+            return row is not None
+        except sqlite3.Error:
+            return False
+
+    def peek(self, method, endpoint, params=None):
+        """Returns a cached payload, fresh or not, without counting it as a hit or touching its access time."""
+        if not self.conn:
+            return None
+        try:
+            with self.lock:
+                row = self.conn.execute(
+                    "SELECT payload FROM responses WHERE key = ?", (self.make_key(method, endpoint, params),)
+                ).fetchone()
+            return json.loads(row[0]) if row else None
+        except (sqlite3.Error, ValueError):
+            return None
+
+    def put(self, method, endpoint, params, payload, ttl, used=True):
+        """Stores a payload for ttl seconds, evicting least recently used entries if over budget.
+
+        used says whether someone is looking at the payload. Background fetches
+        pass False: they keep the entry's last access time, and a new entry
+        gets none, so REFRESH_WINDOW only covers what the plugin actually read.
+        """
+        if not self.conn:
+            return
+        key = self.make_key(method, endpoint, params)
+        text = json.dumps(payload, separators=(',', ':'))
+        now = time.time()
+        try:
+            with self.lock:
+                self._write_pending()
+                accessed_at = now
+                if not used:
+                    row = self.conn.execute("SELECT accessed_at FROM responses WHERE key = ?", (key,)).fetchone()
+                    accessed_at = row[0] if row else 0
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, endpoint, self.make_params(params), text, len(text), now, now + ttl, accessed_at)
+                )
+                self._evict()
+                self.conn.commit()
+        except sqlite3.Error as e:
+            xbmc.log(f"[kodiseerr] Response cache write failed: {e}", xbmc.LOGWARNING)
+
+    def expired(self, limit):
+        """Lists (endpoint, params, ttl) of recently used entries that are past their TTL, most recent first.
+
+        ttl is the lifetime the entry was stored with, so a refresh keeps a per-route override.
+        """
+        if not self.conn:
+            return []
+        now = time.time()
+        try:
+            with self.lock:
+                rows = self.conn.execute(
+                    "SELECT endpoint, params, expires_at - stored_at FROM responses"
+                    " WHERE expires_at <= ? AND accessed_at > ?"
+                    " ORDER BY accessed_at DESC LIMIT ?",
+                    (now, now - REFRESH_WINDOW, limit)
+                ).fetchall()
+            return [(endpoint, json.loads(params), round(ttl)) for endpoint, params, ttl in rows]
+        except (sqlite3.Error, ValueError) as e:
+            xbmc.log(f"[kodiseerr] Response cache scan failed: {e}", xbmc.LOGWARNING)
+            return []
+
+    def set_meta(self, name, value):
+        """Stores a small JSON value, e.g. hints the plugin leaves for the service."""
+        if not self.conn:
+            return
+        try:
+            with self.lock:
+                self.conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (name, json.dumps(value)))
+                self.conn.commit()
+        except sqlite3.Error as e:
+            xbmc.log(f"[kodiseerr] Response cache meta write failed: {e}", xbmc.LOGWARNING)
+
+    def get_meta(self, name, default=None):
+        if not self.conn:
+            return default
+        try:
+            with self.lock:
+                row = self.conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+            return json.loads(row[0]) if row else default
+        except (sqlite3.Error, ValueError):
+            return default
+
+    def _count(self, name, amount=1):
+        self.pending_counts[name] = self.pending_counts.get(name, 0) + amount
+
+    def count(self, name, amount=1):
+        if not self.conn:
+            return
+        with self.lock:
+            self._count(name, amount)
+
+    def _write_pending(self):
+        """Writes the counters and access times kept in memory, as part of the caller's transaction."""
+        if self.pending_counts:
+            self.conn.executemany("INSERT OR IGNORE INTO counters VALUES (?, 0)", ((name,) for name in self.pending_counts))
+            self.conn.executemany("UPDATE counters SET value = value + ? WHERE name = ?",
+                                  ((amount, name) for name, amount in self.pending_counts.items()))
+        if self.pending_access:
+            self.conn.executemany("UPDATE responses SET accessed_at = MAX(accessed_at, ?) WHERE key = ?",
+                                  ((accessed_at, key) for key, accessed_at in self.pending_access.items()))
+        self.pending_counts = {}
+        self.pending_access = {}
+
+    def flush(self):
+        """Writes what reads recorded in memory; one transaction, none if there is nothing to write."""
+        if not self.conn:
+            return
+        try:
+            with self.lock:
+                if self.pending_counts or self.pending_access:
+                    self._write_pending()
+                    self.conn.commit()
+        except sqlite3.Error as e:
+            xbmc.log(f"[kodiseerr] Response cache flush failed: {e}", xbmc.LOGWARNING)
+
+    def counters(self):
+        if not self.conn:
+            return {}
+        try:
+            with self.lock:
+                counters = dict(self.conn.execute("SELECT name, value FROM counters").fetchall())
+                for name, amount in self.pending_counts.items():
+                    counters[name] = counters.get(name, 0) + amount
+                return counters
+        except sqlite3.Error:
+            return {}
+
+    def _evict(self):
+        count, total = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        rows = self.conn.execute("SELECT key, size FROM responses ORDER BY accessed_at DESC").fetchall()
+        keep_count, keep_bytes = 0, 0
+        for index, (key, size) in enumerate(rows):
+            if keep_count >= self.max_entries or keep_bytes + size > self.max_bytes:
+                self.conn.executemany("DELETE FROM responses WHERE key = ?", ((k,) for k, _ in rows[index:]))
+                return
+            keep_count += 1
+            keep_bytes += size
+
+    def clear(self):
+        if not self.conn:
+            return
+        try:
+            with self.lock:
+                self.conn.execute("DELETE FROM responses")
+                self.conn.commit()
+        except sqlite3.Error as e:
+            xbmc.log(f"[kodiseerr] Response cache clear failed: {e}", xbmc.LOGWARNING)
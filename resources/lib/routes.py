@@ -0,0 +1,66 @@
+from collections import namedtuple
+
+# Upcoming releases only change as dates pass, so they can stay cached longer than other lists
+UPCOMING_TTL = 60 * 60
+
+
+class ListRoute(namedtuple('ListRoute', 'endpoint params view content ttl paged args',
+                           defaults=({}, 'media', 'movies', None, True, ()))):
+    """How a plugin mode maps onto one API list.
+
+    endpoint may contain {placeholders} filled from the plugin arguments named
+    in args. view picks the renderer in default.py; content is the Kodi
+    content type, or None to take it from the display_type argument. ttl
+    overrides the response cache's default lifetime for the endpoint (None
+    keeps the default, 0 never caches). paged lists take a page argument.
+    """
+
+    def resolve(self, args, page=1):
+        """Returns (endpoint, params) for the given plugin arguments and page."""
+        endpoint = self.endpoint.format(**{name: args[name] for name in self.args})
+        params = dict(self.params)
+        if self.paged:
+            params['page'] = page
+        return endpoint, params
+
+    def content_type(self, args):
+        if self.content:
+            return self.content
+        return 'movies' if args.get('display_type') == 'movies' else 'tvshows'
+
+
+LIST_ROUTES = {
+    'trending': ListRoute("/discover/trending"),
+    'popular_movies': ListRoute("/discover/movies", {"sortBy": "popularity.desc"}),
+    'popular_tv': ListRoute("/discover/tv", {"sortBy": "popularity.desc"}, content='tvshows'),
+    'upcoming_movies': ListRoute("/discover/movies/upcoming", ttl=UPCOMING_TTL),
+    'upcoming_tv': ListRoute("/discover/tv/upcoming", content='tvshows', ttl=UPCOMING_TTL),
+    'genre': ListRoute("/discover/{display_type}/genre/{genre_id}", content=None, args=('display_type', 'genre_id')),
+    'genres': ListRoute("/genres/{media_type}", view='genres', paged=False, args=('media_type',)),
+    'requests': ListRoute("/request", {'sort': 'added', 'filter': 'all', 'sortDirection': 'desc', 'take': 25},
+                          view='requests', ttl=0, paged=False),
+}
+
+# (label, mode, extra plugin arguments) in the order the main menu shows them
+MAIN_MENU = (
+    ('Trending', 'trending', {}),
+    ('Popular Movies', 'popular_movies', {}),
+    ('Popular TV Shows', 'popular_tv', {}),
+    ('Upcoming Movies', 'upcoming_movies', {}),
+    ('Upcoming TV Shows', 'upcoming_tv', {}),
+    ('Movies by Genre', 'genres', {'media_type': 'movie'}),
+    ('TV Shows by Genre', 'genres', {'media_type': 'tv'}),
+    ('Request Progress', 'requests', {}),
+    ('Search', 'search', {}),
+    ('Diagnostics', 'diagnostics', {}),
+)
+
+
+def startup_lists():
+    """(endpoint, params, ttl) of the first page of every cacheable list on the main menu."""
+    lists = []
+    for _, mode, args in MAIN_MENU:
+        route = LIST_ROUTES.get(mode)
+        if route and route.ttl != 0:
+            lists.append(route.resolve(args) + (route.ttl,))
+    return lists
@@ -0,0 +1,538 @@
+import http.client
+import http.cookiejar
+import json
+import random
+import socket
+import ssl
+import threading
+import time
+import urllib.request
+import zlib
+import xbmc
+import xbmcaddon
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlencode, quote, urljoin, urlsplit
+from resources.lib.circuit_breaker import CircuitBreaker
+from resources.lib.projection import project
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None  # Not bundled with Kodi; without it only gzip/deflate are offered
+
+MAX_WORKERS = 8
+# Idle keep-alive connections kept per host
+POOL_SIZE = 8
+# Node's default keepAliveTimeout is 5s; don't reuse a connection the server may already have dropped
+IDLE_TIMEOUT = 4
+MAX_REDIRECTS = 3
+# Defaults for the connect_timeout/read_timeout settings, in seconds
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 20
+# Extra attempts for a GET that failed on the way (connection errors, gateway errors)
+MAX_RETRIES = 2
+RETRY_BASE_DELAY = 0.25
+RETRY_MAX_DELAY = 2
+RETRY_STATUSES = (429, 502, 503, 504)
+ACCEPT_ENCODING = "gzip, deflate, br" if brotli else "gzip, deflate"
+# Compressed bodies are read and inflated in pieces of this size
+READ_CHUNK = 64 * 1024
+
+
+def elapsed_ms(since):
+    return (time.monotonic() - since) * 1000
+
+
+def timed_create_connection(timings):
+    """socket.create_connection replacement that records DNS and TCP connect times separately."""
+    def create_connection(address, timeout, source_address):
+        host, port = address
+        started = time.monotonic()
+        addresses = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+        timings['dns'] = elapsed_ms(started)
+        started = time.monotonic()
+        error = None
+        for _, _, _, _, sockaddr in addresses:
+            try:
+                sock = socket.create_connection(sockaddr[:2], timeout, source_address)
+                timings['connect'] = elapsed_ms(started)
+                return sock
+            except OSError as e:
+                error = e
+        raise error or OSError(f"Could not resolve {host}")
+    return create_connection
+
+
+class BodyDecoder:
+    """Inflates a gzip, deflate or brotli response body chunk by chunk."""
+
+    def __init__(self, encoding):
+        self.encoding = encoding
+        if encoding in ("gzip", "x-gzip"):
+            self.inflater = zlib.decompressobj(zlib.MAX_WBITS | 16)
+        elif encoding == "deflate":
+            self.inflater = None  # zlib-wrapped or raw, decided by the first chunk
+        elif encoding == "br" and brotli:
+            self.inflater = brotli.Decompressor()
+        else:
+            raise http.client.HTTPException(f"Unsupported Content-Encoding: {encoding}")
+
+    def decompress(self, chunk):
+        try:
+            if self.inflater is None:
+                # Some servers send raw deflate streams despite the zlib framing the RFC asks for
+                zlib_framed = len(chunk) > 1 and chunk[0] & 0x0F == 8 and (chunk[0] << 8 | chunk[1]) % 31 == 0
+                self.inflater = zlib.decompressobj(zlib.MAX_WBITS if zlib_framed else -zlib.MAX_WBITS)
+            if self.encoding == "br":
+                return self.inflater.process(chunk)
+            return self.inflater.decompress(chunk)
+        except (zlib.error, getattr(brotli, "error", zlib.error)) as e:
+            raise http.client.HTTPException(f"Corrupt {self.encoding} response: {e}")
+
+    def flush(self):
+        if self.encoding == "br" or self.inflater is None:
+            return b""
+        return self.inflater.flush()
+
+
+def read_body(resp, timings):
+    """Reads and decodes a response body. timings receives its size on the wire as 'wire_bytes'."""
+    encoding = (resp.getheader("Content-Encoding") or "identity").strip().lower()
+    if encoding == "identity":
+        body = resp.read()
+        timings['wire_bytes'] = len(body)
+        return body
+    decoder = BodyDecoder(encoding)
+    chunks, wire_bytes = [], 0
+    while True:
+        chunk = resp.read(READ_CHUNK)
+        if not chunk:
+            break
+        wire_bytes += len(chunk)
+        chunks.append(decoder.decompress(chunk))
+    chunks.append(decoder.flush())
+    timings['wire_bytes'] = wire_bytes
+    return b"".join(chunks)
+
+
+class ConnectionPool:
+    """Keeps idle keep-alive connections per host so requests skip the TCP/TLS handshake."""
+
+    def __init__(self, ssl_context, max_idle=POOL_SIZE, connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT):
+        self.ssl_context = ssl_context
+        self.max_idle = max_idle
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.idle = {}  # (scheme, host, port) -> [(connection, last used)]
+        self.lock = threading.Lock()
+
+    def _connect(self, scheme, host, port, timings):
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(host, port, timeout=self.connect_timeout, context=self.ssl_context)
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=self.connect_timeout)
+        conn._create_connection = timed_create_connection(timings)
+        started = time.monotonic()
+        conn.connect()
+        if scheme == "https":
+            # Whatever connect() spent beyond DNS and TCP went into the TLS handshake
+            timings['tls'] = elapsed_ms(started) - timings.get('dns', 0) - timings.get('connect', 0)
+        # The connect timeout covered the handshakes, from here on waits are for the server's answer
+        conn.sock.settimeout(self.read_timeout)
+        return conn
+
+    def _acquire(self, key, timings):
+        now = time.monotonic()
+        with self.lock:
+            idle = self.idle.get(key, [])
+            while idle:
+                conn, last_used = idle.pop()
+                if now - last_used < IDLE_TIMEOUT:
+                    return conn, True
+                conn.close()
+        return self._connect(*key, timings), False
+
+    def _release(self, key, conn):
+        with self.lock:
+            idle = self.idle.setdefault(key, [])
+            if len(idle) < self.max_idle:
+                idle.append((conn, time.monotonic()))
+                return
+        conn.close()
+
+    def request(self, method, url, body=None, headers=None, timings=None):
+        """Sends one request and returns (response, body bytes), reusing a pooled connection if possible.
+
+        If a timings dict is passed, it receives the dns/connect/tls (new
+        connections only) and ttfb phases in milliseconds, and the body's
+        wire_bytes. Compressed bodies are returned inflated.
+        """
+        timings = {} if timings is None else timings
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+
+        while True:
+            timings.clear()
+            conn, reused = self._acquire(key, timings)
+            try:
+                started = time.monotonic()
+                conn.request(method, path, body=body, headers=headers or {})
+                resp = conn.getresponse()
+                timings['ttfb'] = elapsed_ms(started)
+                payload = read_body(resp, timings)
+            except (ConnectionResetError, BrokenPipeError, http.client.BadStatusLine):
+                conn.close()
+                if reused:
+                    # The server closed an idle keep-alive connection; retry on a fresh one
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                raise
+
+            if resp.will_close:
+                conn.close()
+            else:
+                self._release(key, conn)
+            return resp, payload
+
+    def close(self):
+        with self.lock:
+            for idle in self.idle.values():
+                for conn, _ in idle:
+                    conn.close()
+            self.idle.clear()
+
+
+class SeerrClient:
+    """Shared Jellyseerr/Overseerr API client. Backends subclass it and override what differs."""
+
+    service_name = "Seerr"
+    login_endpoint = "/auth/local"
+
+    def __init__(self, base_url, username, password, cookie_file=None, cache=None, serve_stale=False, metrics=None,
+                 circuit_file=None, window_cache=None):
+        self.base_url = base_url.rstrip("/")
+        self.username = username
+        self.password = password
+        self.cache = cache  # Optional ResponseCache for read-only endpoints
+        self.serve_stale = serve_stale  # Return expired cache entries and leave refreshing to the service
+        self.metrics = metrics  # Optional Metrics recorder for request timings
+        self.window_cache = window_cache  # Optional WindowCache shared with the next plugin invocations
+        self.breaker = CircuitBreaker(circuit_file)
+        self.pool = None  # Will be initialized with SSL context
+        self.logged_in = False
+        # Concurrent requests share one session: logins are serialized, and a rejected
+        # session is only replaced by the first thread that notices (see relogin())
+        self.auth_lock = threading.RLock()
+        self.session_generation = 0
+        if cookie_file:
+            self.cookie_jar = http.cookiejar.LWPCookieJar(cookie_file)
+            self.load_session()
+        else:
+            self.cookie_jar = http.cookiejar.CookieJar()
+
+    def load_session(self):
+        """Restores the session cookie saved by a previous plugin invocation."""
+        try:
+            self.cookie_jar.load(ignore_discard=True)
+        except (OSError, http.cookiejar.LoadError):
+            return
+        self.logged_in = len(self.cookie_jar) > 0
+
+    def save_session(self):
+        """Persists the session cookie so the next invocation can skip login."""
+        if not isinstance(self.cookie_jar, http.cookiejar.FileCookieJar):
+            return
+        try:
+            self.cookie_jar.save(ignore_discard=True)
+        except OSError as e:
+            xbmc.log(f"[kodiseerr] Could not save session: {e}", xbmc.LOGWARNING)
+
+    def invalidate_session(self):
+        """Drops the current session so the next request logs in again."""
+        self.logged_in = False
+        self.cookie_jar.clear()
+        self.save_session()
+
+    def init_transport(self):
+        """Initializes the connection pool with an SSL context based on addon settings."""
+        addon = xbmcaddon.Addon()
+        allow_self_signed = addon.getSettingBool("allow_self_signed")
+
+        if allow_self_signed:
+            ssl_context = ssl._create_unverified_context()
+        else:
+            ssl_context = ssl.create_default_context()
+
+        if self.pool:
+            self.pool.close()
+        self.pool = ConnectionPool(
+            ssl_context,
+            connect_timeout=self._timeout_setting(addon, "connect_timeout", CONNECT_TIMEOUT),
+            read_timeout=self._timeout_setting(addon, "read_timeout", READ_TIMEOUT),
+        )
+
+    @staticmethod
+    def _timeout_setting(addon, setting_id, default):
+        try:
+            return max(1, int(addon.getSetting(setting_id)))
+        except ValueError:
+            return default
+
+    def send(self, method, url, body=None, headers=None, timings=None):
+        """Sends a request with session cookies attached, following redirects. Returns (status, body bytes).
+
+        timings receives the connection phases of the last hop, see ConnectionPool.request().
+        """
+        if not self.pool:
+            self.init_transport()
+
+        for _ in range(MAX_REDIRECTS + 1):
+            # urllib's Request is only used here to let the cookie jar apply its domain/path policy
+            cookie_req = urllib.request.Request(url, method=method)
+            self.cookie_jar.add_cookie_header(cookie_req)
+            request_headers = dict(headers or {})
+            request_headers.update(cookie_req.unredirected_hdrs)
+
+            resp, payload = self.pool.request(method, url, body=body, headers=request_headers, timings=timings)
+            self.cookie_jar.extract_cookies(resp, cookie_req)
+
+            location = resp.getheader("Location")
+            if resp.status in (301, 302, 303, 307, 308) and location:
+                url = urljoin(url, location)
+                if resp.status == 303 or (resp.status in (301, 302) and method == "POST"):
+                    method, body = "GET", None
+                continue
+            return resp.status, payload
+        return resp.status, payload
+
+    def login(self):
+        """Logs into the Jellyseerr/Overseerr instance."""
+        with self.auth_lock:
+            if not self.logged_in:
+                self._login()
+
+    def _login(self):
+        login_url = f"{self.base_url}{self.login_endpoint}"
+        data = json.dumps({
+            "email": self.username,
+            "password": self.password
+        }).encode('utf-8')
+
+        try:
+            status, _ = self.send("POST", login_url, data, {"Content-Type": "application/json"})
+        except (OSError, http.client.HTTPException) as e:
+            self.breaker.record_failure()
+            xbmc.log(f"[kodiseerr] {self.service_name} login failed: {e}", xbmc.LOGERROR)
+            return
+        # Any answer below 500, rejected credentials included, shows the server is up
+        if status >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        if status >= 400:
+            xbmc.log(f"[kodiseerr] {self.service_name} login failed: HTTP {status}", xbmc.LOGERROR)
+            return
+        self.logged_in = True
+        self.session_generation += 1
+        self.save_session()
+
+    def relogin(self, rejected_generation):
+        """Logs in again after the server rejected the session of rejected_generation.
+
+        Threads that sent the same session and got rejected too find a newer
+        one here and reuse it instead of logging in over it. Returns whether a
+        session is available.
+        """
+        with self.auth_lock:
+            if self.session_generation == rejected_generation or not self.logged_in:
+                self.invalidate_session()
+                self.login()
+            return self.logged_in
+
+    def api_request(self, endpoint, method="GET", data=None, params=None, retry_auth=True, refresh=False, ttl=None):
+        """Sends an authenticated API request to the server.
+
+        A saved session is reused until the server rejects it, at which point
+        the client logs in again and retries the request once. GET responses
+        of cacheable endpoints are served from the response cache while fresh,
+        or while stale too when serve_stale is set. refresh skips the cache
+        lookup but still stores the new response. ttl overrides the cache's
+        lifetime for the endpoint, 0 bypasses the cache.
+
+        Details the next invocation is likely to ask for again are also
+        handed over through the window cache, which is checked first.
+
+        GETs that fail on the way are retried with jittered backoff, except
+        after a timeout. Failures feed the circuit breaker; while it is open
+        requests are skipped and, like failed requests, answered from the
+        cache however stale it is.
+        """
+        window_ttl = self.window_cache.ttl_for(endpoint) if self.window_cache and method == "GET" else 0
+        if window_ttl and not refresh:
+            started = time.monotonic()
+            shared = self.window_cache.get(endpoint, params)
+            if shared is not None:
+                if self.metrics:
+                    self.metrics.record_cached(method, endpoint, elapsed_ms(started))
+                return shared
+
+        if not self.cache or method != "GET":
+            ttl = 0
+        elif ttl is None:
+            ttl = self.cache.ttl_for(endpoint)
+        if ttl and not refresh:
+            started = time.monotonic()
+            cached = self.cache.get(method, endpoint, params, allow_stale=self.serve_stale)
+            if cached is not None:
+                if self.metrics:
+                    self.metrics.record_cached(method, endpoint, elapsed_ms(started))
+                return cached
+
+        if not self.breaker.allow():
+            xbmc.log(f"[kodiseerr] Server unreachable, skipping {endpoint} for another {self.breaker.retry_in():.0f}s",
+                     xbmc.LOGDEBUG)
+            return self._fallback(method, endpoint, params, ttl, refresh)
+        try:
+            return self._send_request(endpoint, method, data, params, retry_auth, refresh, ttl, window_ttl)
+        finally:
+            # A trial that ended without recording a result must not keep the circuit shut for good
+            self.breaker.end_trial()
+
+    def _send_request(self, endpoint, method, data, params, retry_auth, refresh, ttl, window_ttl):
+        if not self.logged_in:
+            self.login()
+            if not self.logged_in and self.breaker.is_open:
+                return self._fallback(method, endpoint, params, ttl, refresh)
+
+        url = self.base_url + endpoint
+        if params:
+            safe_params = {k: str(v) for k, v in params.items()}
+            url += '?' + urlencode(safe_params, quote_via=quote)
+
+        body = json.dumps(data).encode('utf-8') if data is not None else None
+        headers = {"Accept": "application/json", "Accept-Encoding": ACCEPT_ENCODING}
+        if method == "POST":
+            headers["Content-Type"] = "application/json"
+
+        status, payload, error = None, b"", None
+        attempts = 1 + MAX_RETRIES if method == "GET" else 1
+        for attempt in range(attempts):
+            if attempt:
+                self._backoff(attempt)
+            timings = {}
+            started = time.monotonic()
+            generation = self.session_generation
+            try:
+                status, payload = self.send(method, url, body, headers, timings)
+            except (OSError, http.client.HTTPException) as e:
+                status, payload, error = None, b"", e
+            if self.metrics:
+                self.metrics.record_request(method, endpoint, status, len(payload), dict(timings, total=elapsed_ms(started)))
+            # A timed out server is too slow or gone, another attempt would only double the wait
+            if isinstance(error, socket.timeout) or (status is not None and status not in RETRY_STATUSES):
+                break
+            if attempt + 1 < attempts:
+                xbmc.log(f"[kodiseerr] {endpoint} failed ({error or status}), retrying", xbmc.LOGDEBUG)
+
+        if status is None or status >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        if status is None:
+            xbmc.log(f"[kodiseerr] API request failed: {error}", xbmc.LOGERROR)
+            xbmc.log(f"[kodiseerr] Failed URL: {url}", xbmc.LOGERROR)
+            return self._fallback(method, endpoint, params, ttl, refresh)
+
+        if status in (401, 403) and retry_auth:
+            xbmc.log(f"[kodiseerr] Session rejected ({status}), logging in again", xbmc.LOGINFO)
+            if self.relogin(generation):
+                return self.api_request(endpoint, method, data, params, retry_auth=False, refresh=refresh, ttl=ttl)
+        if status >= 400:
+            xbmc.log(f"[kodiseerr] API request failed: HTTP {status}", xbmc.LOGERROR)
+            xbmc.log(f"[kodiseerr] Failed URL: {url}", xbmc.LOGERROR)
+            return self._fallback(method, endpoint, params, ttl, refresh) if status >= 500 else None
+
+        try:
+            # json detects the encoding of bytes itself, which saves decoding into an extra string first
+            result = project(endpoint, json.loads(payload))
+        except ValueError as e:
+            xbmc.log(f"[kodiseerr] Invalid JSON from {url}: {e}", xbmc.LOGERROR)
+            return None
+        # Let the raw body go before the cache serializes the result again
+        del payload
+        if ttl:
+            # Refreshes and prefetches come from the service, nobody has looked at them yet
+            self.cache.put(method, endpoint, params, result, ttl, used=not refresh)
+        if window_ttl:
+            self.window_cache.put(endpoint, params, result, window_ttl)
+        return result
+
+    def forget(self, endpoint, params=None):
+        """Drops the shared copy of a response that is about to change, e.g. media that was just requested."""
+        if self.window_cache:
+            self.window_cache.forget(endpoint, params)
+
+    @staticmethod
+    def _backoff(attempt):
+        delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempt - 1))
+        # Half fixed, half random, so parallel requests don't retry in lockstep
+        time.sleep(delay / 2 + random.uniform(0, delay / 2))
+
+    def _fallback(self, method, endpoint, params, ttl, refresh):
+        """Answers a request the server couldn't from the cache, however stale. Refreshes get None."""
+        if not ttl or refresh:
+            return None
+        cached = self.cache.get(method, endpoint, params, allow_stale=True)
+        if cached is not None:
+            xbmc.log(f"[kodiseerr] Serving cached {endpoint} while the server is unavailable", xbmc.LOGINFO)
+        return cached
+
+    def refresh_expired(self, limit):
+        """Re-fetches up to limit expired cache entries. Returns how many were refreshed."""
+        if not self.cache:
+            return 0
+        refreshed = 0
+        for endpoint, params, ttl in self.cache.expired(limit):
+            if self.api_request(endpoint, params=params, refresh=True, ttl=ttl) is not None:
+                refreshed += 1
+        if refreshed:
+            self.cache.count("refreshes", refreshed)
+        return refreshed
+
+    def api_request_many(self, calls, max_workers=MAX_WORKERS, progress=None):
+        """Runs several API requests concurrently and returns their results in order.
+
+        Each call is either an endpoint string or a dict of api_request keyword
+        arguments. A failed call yields None instead of aborting the batch.
+        progress(done, total) is called from the calling thread as calls finish.
+        """
+        calls = [{"endpoint": c} if isinstance(c, str) else c for c in calls]
+        if not calls:
+            return []
+
+        # Log in once up front so the workers don't race each other to /auth/local
+        if not self.logged_in and not self.breaker.is_open:
+            self.login()
+        if not self.pool:
+            self.init_transport()
+
+        def run(call):
+            try:
+                return self.api_request(**call)
+            except Exception as e:
+                xbmc.log(f"[kodiseerr] Batched request failed: {e}", xbmc.LOGERROR)
+                return None
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(calls)))) as pool:
+            if not progress:
+                return list(pool.map(run, calls))
+            futures = [pool.submit(run, call) for call in calls]
+            for done, _ in enumerate(as_completed(futures), 1):
+                progress(done, len(futures))
+            return [future.result() for future in futures]
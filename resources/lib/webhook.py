@@ -0,0 +1,99 @@
+import hmac
+import json
+import threading
+import time
+import xbmc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+MAX_BODY = 64 * 1024
+AVAILABLE_EVENT = "MEDIA_AVAILABLE"
+TEST_EVENT = "TEST_NOTIFICATION"
+
+
+def summarize(payload):
+    """Maps Jellyseerr's default webhook JSON onto the same shape as request_poller.summarize()."""
+    media = payload.get('media') or {}
+    return {
+        'request_id': (payload.get('request') or {}).get('request_id'),
+        'media_id': str(media.get('tmdbId') or ""),
+        'media_type': media.get('media_type') or "",
+        'title': payload.get('subject') or "Media",
+        'status': 5,
+    }
+
+
+class WebhookReceiver:
+    """Small HTTP listener for Jellyseerr/Overseerr webhook notifications.
+
+    Requests must carry the shared secret in the Authorization header (the
+    "Authorization Header" field of the webhook agent). Each MEDIA_AVAILABLE
+    event is passed to on_available on the listener thread.
+    """
+
+    def __init__(self, port, secret, on_available):
+        self.port = port
+        self.secret = secret
+        self.on_available = on_available
+        self.last_seen = 0
+        self.server = None
+
+    def start(self):
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                xbmc.log(f"[KodiSeerr Webhook] {format % args}", xbmc.LOGDEBUG)
+
+            def do_POST(self):
+                auth = self.headers.get('Authorization') or ""
+                if not hmac.compare_digest(auth.encode('utf-8'), receiver.secret.encode('utf-8')):
+                    self.send_error(401)
+                    return
+                try:
+                    length = int(self.headers.get('Content-Length') or 0)
+                except ValueError:
+                    length = -1
+                if length <= 0 or length > MAX_BODY:
+                    self.send_error(400)
+                    return
+                try:
+                    payload = json.loads(self.rfile.read(length))
+                except ValueError:
+                    self.send_error(400)
+                    return
+                if not isinstance(payload, dict):
+                    self.send_error(400)
+                    return
+
+                self.send_response(204)
+                self.end_headers()
+
+                receiver.last_seen = time.time()
+                event = payload.get('notification_type')
+                if event == AVAILABLE_EVENT:
+                    try:
+                        receiver.on_available(summarize(payload))
+                    except Exception as e:
+                        xbmc.log(f"[KodiSeerr Webhook] Handling notification failed: {e}", xbmc.LOGERROR)
+                elif event == TEST_EVENT:
+                    xbmc.log("[KodiSeerr Webhook] Test notification received", xbmc.LOGINFO)
+
+        try:
+            self.server = ThreadingHTTPServer(('', self.port), Handler)
+        except OSError as e:
+            xbmc.log(f"[KodiSeerr Webhook] Could not listen on port {self.port}: {e}", xbmc.LOGERROR)
+            return False
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name="kodiseerr-webhook", daemon=True).start()
+        xbmc.log(f"[KodiSeerr Webhook] Listening on port {self.port}", xbmc.LOGINFO)
+        return True
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def seen_within(self, seconds):
+        """Whether the server has delivered a webhook recently enough to trust it over polling."""
+        return time.time() - self.last_seen < seconds
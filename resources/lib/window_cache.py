@@ -0,0 +1,103 @@
+import json
+import re
+import threading
+import time
+import xbmc
+import xbmcgui
+
+# Kodi's Home window lives as long as Kodi does, so its properties outlast any one plugin invocation
+HOME_WINDOW = 10000
+PREFIX = "kodiseerr.wc."
+
+# (endpoint pattern, seconds a payload is reused). Details are fetched by the media
+# dialog, then again by the seasons list and the request routes right after it.
+TTL_RULES = (
+    (re.compile(r'^/(movie|tv)/\d+$'), 5 * 60),
+)
+# Window properties sit in Kodi's memory, keep them small
+MAX_BYTES = 1024 * 1024
+
+
+class WindowCache:
+    """Hands API payloads from one plugin invocation to the next through Home window properties.
+
+    Each payload is stored as JSON in its own property; an index property
+    tracks expiry and size so the oldest entries go once max_bytes is
+    exceeded. Nothing touches the disk or the network. Property names
+    include scope (the session key), so another server or user never
+    reads these payloads.
+    """
+
+    def __init__(self, scope="", window_id=HOME_WINDOW, max_bytes=MAX_BYTES):
+        self.window = xbmcgui.Window(window_id)
+        self.max_bytes = max_bytes
+        self.prefix = f"{PREFIX}{scope}."
+        self.index_key = self.prefix + "index"
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def ttl_for(endpoint):
+        for pattern, ttl in TTL_RULES:
+            if pattern.match(endpoint):
+                return ttl
+        return 0
+
+    def make_key(self, endpoint, params=None):
+        return self.prefix + endpoint + "?" + json.dumps({k: str(v) for k, v in (params or {}).items()}, sort_keys=True)
+
+    def _index(self):
+        try:
+            index = json.loads(self.window.getProperty(self.index_key) or "{}")
+            return index if isinstance(index, dict) else {}
+        except ValueError:
+            return {}
+
+    def _save_index(self, index):
+        self.window.setProperty(self.index_key, json.dumps(index))
+
+    def get(self, endpoint, params=None):
+        key = self.make_key(endpoint, params)
+        with self.lock:
+            entry = self._index().get(key)
+            if not entry:
+                return None
+            if entry[0] <= time.time():
+                self._remove(key)
+                return None
+            raw = self.window.getProperty(key)
+        try:
+            return json.loads(raw) if raw else None
+        except ValueError:
+            return None
+
+    def put(self, endpoint, params, payload, ttl):
+        raw = json.dumps(payload, separators=(',', ':'))
+        if len(raw) > self.max_bytes:
+            return
+        key = self.make_key(endpoint, params)
+        now = time.time()
+        with self.lock:
+            index = self._index()
+            index[key] = [now + ttl, len(raw)]
+            # Expired entries first, then the ones closest to expiring, until everything fits
+            total = sum(size for _, size in index.values())
+            for old_key, (expires_at, size) in sorted(index.items(), key=lambda item: item[1][0]):
+                if old_key == key or (expires_at > now and total <= self.max_bytes):
+                    continue
+                self.window.clearProperty(old_key)
+                del index[old_key]
+                total -= size
+            self.window.setProperty(key, raw)
+            self._save_index(index)
+
+    def _remove(self, key):
+        index = self._index()
+        index.pop(key, None)
+        self.window.clearProperty(key)
+        self._save_index(index)
+
+    def forget(self, endpoint, params=None):
+        """Drops an entry, e.g. after a request changed the media's status."""
+        with self.lock:
+            self._remove(self.make_key(endpoint, params))
+        xbmc.log(f"[kodiseerr] Dropped shared copy of {endpoint}", xbmc.LOGDEBUG)
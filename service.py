@@ -2,12 +2,73 @@ import xbmc
 import xbmcaddon
 import xbmcgui
 import xbmcvfs
-import json
+import time
 import api_client
 import os
+from resources.lib import artwork, prefetch
+from resources.lib.request_poller import RequestPoller
+from resources.lib.poll_scheduler import PollScheduler, REQUEST_SENT_MESSAGE
+from resources.lib.notification_ledger import NotificationLedger, DEFAULT_MAX_AGE_DAYS
+from resources.lib.webhook import WebhookReceiver
+from resources.lib.library_index import LibraryIndex
 
 addon = xbmcaddon.Addon()
-monitor = xbmc.Monitor()
+
+# How often the loop wakes up for background work between request polls
+TICK_SECONDS = 30
+# Upper bound on expired cache entries re-fetched per tick
+REFRESH_BATCH = 5
+# Upper bound on lists warmed per tick
+PREFETCH_BATCH = 3
+
+# Request timings and cache counters are written out this often, to keep SD-card writes down
+FLUSH_SECONDS = 10 * 60
+# While webhooks arrived within this window, polling only runs as a slow safety net
+WEBHOOK_TRUST_WINDOW = 24 * 60 * 60
+
+class ServiceMonitor(xbmc.Monitor):
+    def __init__(self):
+        super().__init__()
+        self.wake = False
+        self.messages = set()
+        self.library_index = None
+        self.settings_changed = False
+
+    def onSettingsChanged(self):
+        self.settings_changed = True
+        self.wake = True
+
+    def onNotification(self, sender, method, data):
+        if sender == addon.getAddonInfo('id'):
+            # NotifyAll delivers our messages as "Other.<message>"
+            self.messages.add(method.rsplit('.', 1)[-1])
+            self.wake = True
+        elif self.library_index and method.startswith('VideoLibrary.'):
+            try:
+                self.library_index.handle_notification(method, data)
+            except Exception:
+                import traceback
+                traceback.print_exc()
+
+    def take(self, message):
+        """Returns whether the plugin sent message since the last call, consuming it."""
+        if message in self.messages:
+            self.messages.discard(message)
+            return True
+        return False
+
+    def sleep(self, seconds):
+        """Waits up to seconds, returning early when the plugin wakes us. Returns True on abort."""
+        remaining = seconds
+        while remaining > 0 and not self.wake:
+            if self.waitForAbort(min(1, remaining)):
+                return True
+            remaining -= 1
+        self.wake = False
+        return False
+
+monitor = ServiceMonitor()
+player = xbmc.Player()
 
 def get_interval():
     try:
@@ -18,43 +79,182 @@ def get_interval():
         traceback.print_exc()
         return 300
 
-def main_loop():
-    data_path = xbmcvfs.translatePath(f"special://profile/addon_data/{addon.getAddonInfo('id')}/")
-    os.makedirs(data_path, exist_ok=True)
-    notified_file = os.path.join(data_path, "notified_requests.json")
+def get_ledger_days():
+    try:
+        return max(1, int(addon.getSetting('notification_ledger_days')))
+    except Exception:
+        return DEFAULT_MAX_AGE_DAYS
+
+def get_idle_interval():
+    try:
+        return max(get_interval(), int(addon.getSetting('idle_polling_interval')))
+    except Exception:
+        import traceback
+        traceback.print_exc()
+        return 3600
+
+def announce(ledger, media):
+    """Shows the "now available" notification once per media, whether it came from polling or a webhook."""
+    if media['media_id'] and ledger.add(media['media_type'], media['media_id']):
+        xbmcgui.Dialog().notification('KodiSeerr', f"{media['title']} is now available!", xbmcgui.NOTIFICATION_INFO)
+
+def start_webhook(ledger):
+    if not addon.getSettingBool('enable_webhook'):
+        return None
+    secret = addon.getSetting('webhook_secret')
+    if not secret:
+        xbmc.log("[KodiSeerr Service] Webhook enabled without a shared secret, not starting it", xbmc.LOGWARNING)
+        return None
+    try:
+        port = int(addon.getSetting('webhook_port'))
+    except ValueError:
+        port = 8765
+    receiver = WebhookReceiver(port, secret, lambda media: announce(ledger, media))
+    return receiver if receiver.start() else None
+
+def check_requests(poller, ledger):
+    """Polls for newly available requests and notifies about them. Returns False if the server failed."""
+    try:
+        available = poller.poll()
+    except Exception:
+        import traceback
+        traceback.print_exc()
+        available = None
+    if available is None:
+        xbmc.log("[KodiSeerr Service] Fetch requests failed", xbmc.LOGERROR)
+        return False
+
+    for media in available:
+        announce(ledger, media)
+    ledger.expire()
+    return True
+
+def refresh_cache():
+    """Revalidates cached lists the plugin served stale, keeping that work off the UI path."""
+    client = api_client.client
+    if not client.cache or not client.serve_stale:
+        return
+    try:
+        refreshed = client.refresh_expired(REFRESH_BATCH)
+    except Exception:
+        import traceback
+        traceback.print_exc()
+        xbmc.log("[KodiSeerr Service] Cache refresh failed", xbmc.LOGERROR)
+        return
+    if refreshed:
+        counters = client.cache.counters()
+        xbmc.log(f"[KodiSeerr Service] Refreshed {refreshed} cached lists, cache counters: {counters}", xbmc.LOGDEBUG)
+
+def prefetch_lists(prefetcher):
+    if not prefetcher:
+        return
     try:
-        with open(notified_file, 'r') as f:
-            notified_ids = set(json.load(f))
+        prefetcher.schedule_next_page()
+        prefetcher.run(PREFETCH_BATCH)
     except Exception:
         import traceback
         traceback.print_exc()
-        notified_ids = set()
+        xbmc.log("[KodiSeerr Service] Prefetch failed", xbmc.LOGERROR)
+
+def prewarm_artwork(prewarmer):
+    if not prewarmer:
+        return
+    try:
+        prewarmer.run()
+    except Exception:
+        import traceback
+        traceback.print_exc()
+        xbmc.log("[KodiSeerr Service] Artwork pre-warming failed", xbmc.LOGERROR)
+
+def build_library_index():
+    index = LibraryIndex()
+    try:
+        index.rebuild()
+        index.save()
+    except Exception:
+        import traceback
+        traceback.print_exc()
+        xbmc.log("[KodiSeerr Service] Building the library index failed", xbmc.LOGERROR)
+    return index
+
+def processing_only_scope():
+    # "1" = only follow in-progress requests, for accounts with a long request history
+    return addon.getSetting('notification_scope') == "1"
+
+def apply_settings(poller):
+    """Picks up changed polling settings, returning the scheduler to use from now on."""
+    processing_only = processing_only_scope()
+    if processing_only != poller.processing_only:
+        poller.processing_only = processing_only
+        # Start the high-water mark afresh rather than paging back to wherever it was left
+        poller.state['watermark'] = None
+    return PollScheduler(get_interval(), get_idle_interval())
+
+def main_loop():
+    data_path = xbmcvfs.translatePath(f"special://profile/addon_data/{addon.getAddonInfo('id')}/")
+    os.makedirs(data_path, exist_ok=True)
+    ledger = NotificationLedger(os.path.join(data_path, "notifications.db"), get_ledger_days())
+    ledger.import_legacy(os.path.join(data_path, "notified_requests.json"))
+
+    poller = RequestPoller(api_client.client, os.path.join(data_path, "poller_state.json"), processing_only_scope())
+
+    prefetcher = None
+    if api_client.client.cache and addon.getSettingBool('enable_prefetch'):
+        prefetcher = prefetch.Prefetcher(api_client.client, monitor)
+
+    prewarmer = None
+    artwork_policy = artwork.ArtworkPolicy.from_settings(addon, data_path)
+    if artwork_policy.cache:
+        artwork_policy.cache.trim()
+        prewarmer = artwork.Prewarmer(artwork_policy, api_client.client.cache)
 
+    scheduler = PollScheduler(get_interval(), get_idle_interval())
+    receiver = start_webhook(ledger)
+    monitor.library_index = build_library_index()
+
+    next_poll = 0
+    next_flush = time.time() + FLUSH_SECONDS
     while not monitor.abortRequested():
-        if addon.getSettingBool('enable_request_notifications'):
-            try:
-                requests_data = api_client.client.api_request('/request')
-            except Exception:
-                import traceback
-                traceback.print_exc()
-                xbmc.log("[KodiSeerr Service] Fetch requests failed", xbmc.LOGERROR)
-            else:
-                items = requests_data.get('results', []) if isinstance(requests_data, dict) else []
-                for item in items:
-                    media = item.get('media') or {}
-                    media_status = media.get('status', 1)
-                    title = media.get('title') or media.get('name') or "Media"
-                    media_id = str(media.get('tmdbId') or media.get('id') or "")
-
-                    if media_status == 5 and media_id and media_id not in notified_ids:
-                        xbmcgui.Dialog().notification('KodiSeerr', f'{title} is now available!', xbmcgui.NOTIFICATION_INFO)
-                        notified_ids.add(media_id)
-
-                with open(notified_file, 'w') as f:
-                    json.dump(list(notified_ids), f)
-
-        if monitor.waitForAbort(get_interval()):
+        # Library notifications only mark the index dirty, write it once per tick
+        if monitor.library_index.dirty:
+            monitor.library_index.save()
+
+        if monitor.settings_changed:
+            monitor.settings_changed = False
+            scheduler = apply_settings(poller)
+            next_poll = min(next_poll, time.time() + scheduler.base_interval)
+
+        if monitor.take(REQUEST_SENT_MESSAGE):
+            scheduler.reset()
+            next_poll = min(next_poll, time.time() + scheduler.base_interval)
+
+        # Stay completely quiet while a video is playing
+        if not player.isPlayingVideo():
+            if time.time() >= next_poll:
+                if addon.getSettingBool('enable_request_notifications'):
+                    ok = check_requests(poller, ledger)
+                    # Webhooks deliver notifications instantly, polling just backs them up
+                    urgent = poller.has_pending and not (receiver and receiver.seen_within(WEBHOOK_TRUST_WINDOW))
+                    delay = scheduler.next_delay(urgent, not ok, poller.changed)
+                else:
+                    delay = scheduler.max_interval
+                xbmc.log(f"[KodiSeerr Service] Next request poll in {delay}s", xbmc.LOGDEBUG)
+                next_poll = time.time() + delay
+
+            prefetch_lists(prefetcher)
+            refresh_cache()
+            prewarm_artwork(prewarmer)
+
+        if time.time() >= next_flush:
+            api_client.flush()
+            next_flush = time.time() + FLUSH_SECONDS
+
+        if monitor.sleep(min(TICK_SECONDS, max(1, next_poll - time.time()))):
             break
 
+    if receiver:
+        receiver.stop()
+    api_client.flush()
+
 if __name__ == '__main__':
     main_loop()